@@ -0,0 +1,8 @@
+import sys
+
+from pathlib import Path
+
+
+# Add-on package imports bpy on init, so its Blender-free packages are imported as top-level ones instead
+addon_path = Path(__file__).parent.parent / 'wwmi-tools'
+sys.path.insert(0, str(addon_path))
@@ -0,0 +1,82 @@
+"""
+Checks of buffers passed between processes, run without Blender:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import pickle
+import subprocess
+import multiprocessing
+import pytest
+
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from migoto_io.buffers.byte_buffer import ByteBuffer, BufferSemantic, AbstractSemantic
+from migoto_io.buffers.benchmark import get_benchmark_layouts, generate_buffer
+
+
+layouts = get_benchmark_layouts()
+
+
+def check_unpickled_layouts():
+    """
+    Reads pickled layouts from stdin and prints names of ones that fail to look up semantics created in this process
+    """
+    for layout_name, layout in pickle.load(sys.stdin.buffer).items():
+        for semantic in layout.semantics:
+            abstract_semantic = AbstractSemantic(semantic.semantic.semantic, semantic.semantic.index)
+            buffer_semantic = BufferSemantic(abstract_semantic, semantic.format, semantic.stride, semantic.offset)
+            if layout.get_element(abstract_semantic) != semantic or not layout.has_element(buffer_semantic):
+                print(layout_name)
+                break
+
+
+def get_semantic_arrays(byte_buffer):
+    """
+    Returns decoded arrays of all semantics of buffer, looked up by abstract semantics created in this process
+    """
+    return [
+        byte_buffer.get_array(AbstractSemantic(semantic.semantic.semantic, semantic.semantic.index)).tobytes()
+        for semantic in byte_buffer.layout.semantics
+    ]
+
+
+def read_shared_buffer(descriptor):
+    byte_buffer = ByteBuffer.from_shared_memory(descriptor)
+    try:
+        return get_semantic_arrays(byte_buffer)
+    finally:
+        byte_buffer.detach()
+
+
+@pytest.fixture(scope='module')
+def spawn_executor():
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('hash_seed', ['1', '2'])
+def test_unpickled_layouts_with_other_hash_seed(hash_seed):
+    tests_path = Path(__file__).parent
+    python_path = os.pathsep.join([str(tests_path), str(tests_path.parent / 'wwmi-tools')])
+    result = subprocess.run(
+        [sys.executable, '-c', f'from {__name__} import check_unpickled_layouts; check_unpickled_layouts()'],
+        input=pickle.dumps(layouts), capture_output=True,
+        env={**os.environ, 'PYTHONPATH': python_path, 'PYTHONHASHSEED': hash_seed},
+    )
+    assert result.returncode == 0, result.stderr.decode()
+    assert result.stdout.decode().split() == []
+
+
+@pytest.mark.parametrize('layout_name', list(layouts))
+def test_shared_memory_in_spawned_process(spawn_executor, layout_name):
+    byte_buffer = generate_buffer(layouts[layout_name], 1000)
+    shared_memory, descriptor = byte_buffer.to_shared_memory()
+    try:
+        arrays = spawn_executor.submit(read_shared_buffer, descriptor).result()
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+    assert arrays == get_semantic_arrays(byte_buffer)
@@ -16,6 +16,7 @@ from ..migoto_io.blender_interface.mesh import *
 
 from ..migoto_io.buffers.dxgi_format import DXGIFormat
 from ..migoto_io.buffers.byte_buffer import ByteBuffer, BufferElementLayout, BufferSemantic, AbstractSemantic, Semantic
+from ..migoto_io.buffers.wwmi_layouts import get_export_vertex_buffers
 
 from ..extract_frame_data.metadata_format import read_metadata
 
@@ -28,19 +29,6 @@ from .ini_maker import IniMaker, is_ini_edited
 class Fatal(Exception): pass
 
 
-def translate_vectors(dxgi_format, flip):
-    if dxgi_format.get_format().endswith('_UNORM'):
-        # Scale normal range -1:+1 to UNORM range 0:+1
-        if flip:
-            return lambda x: -x/2.0 + 0.5
-        else:
-            return lambda x: x/2.0 + 0.5
-    if flip:
-        return lambda x: -x
-    else:
-        return lambda x: x
-
-
 def normalize_weights(weights):
     '''
     Noramlizes provided list of float weights in a 8-bit friendly way 
@@ -95,6 +83,8 @@ class DataMap:
     IndexBuffer: Dict[str, List[BufferSemantic]]
     VertexBuffers: Dict[str, List[BufferSemantic]]
     ShapeKeyBuffers: Dict[str, List[BufferSemantic]]
+    # Transforms that set semantic values of built buffer at once, way faster than per-loop or per-vertex converters
+    BufferTransforms: Dict[AbstractSemantic, LambdaType] = field(default_factory=dict)
 
 
 def get_default_data_map():
@@ -104,10 +94,10 @@ def get_default_data_map():
             AbstractSemantic(Semantic.Tangent): lambda data: data + (1.0,),
             AbstractSemantic(Semantic.Normal): lambda data: data,
             AbstractSemantic(Semantic.Color, 0): None,
-            AbstractSemantic(Semantic.TexCoord, 0): lambda uv: (uv[0], 1.0 - uv[1]),
+            AbstractSemantic(Semantic.TexCoord, 0): None,
             AbstractSemantic(Semantic.Color, 1): lambda data: data[0:2],
-            AbstractSemantic(Semantic.TexCoord, 1): lambda uv: (uv[0], 1.0 - uv[1]),
-            AbstractSemantic(Semantic.TexCoord, 2): lambda uv: (uv[0], 1.0 - uv[1]),
+            AbstractSemantic(Semantic.TexCoord, 1): None,
+            AbstractSemantic(Semantic.TexCoord, 2): None,
         }),
         VertexDataConverters=OrderedDict({
             AbstractSemantic(Semantic.Position): None,
@@ -118,28 +108,7 @@ def get_default_data_map():
             'Index': [
                 BufferSemantic(AbstractSemantic(Semantic.Index), DXGIFormat.R32_UINT, stride=12)
             ]},
-        VertexBuffers={
-            'Position': [
-                BufferSemantic(AbstractSemantic(Semantic.Position, 0), DXGIFormat.R32G32B32_FLOAT)
-            ],
-            'Blend': [
-                BufferSemantic(AbstractSemantic(Semantic.Blendindices, 0), DXGIFormat.R8_UINT, stride=4),
-                BufferSemantic(AbstractSemantic(Semantic.Blendweight, 0), DXGIFormat.R8_UINT, stride=4),
-            ],
-            'Vector': [
-                BufferSemantic(AbstractSemantic(Semantic.Tangent, 0), DXGIFormat.R8G8B8A8_SNORM),
-                BufferSemantic(AbstractSemantic(Semantic.Normal, 0), DXGIFormat.R8G8B8A8_SNORM),
-            ],
-            'Color': [
-                BufferSemantic(AbstractSemantic(Semantic.Color, 0), DXGIFormat.R8G8B8A8_UNORM),
-            ],
-            'TexCoord': [
-                BufferSemantic(AbstractSemantic(Semantic.TexCoord, 0), DXGIFormat.R16G16_FLOAT),
-                BufferSemantic(AbstractSemantic(Semantic.Color, 1), DXGIFormat.R16G16_UNORM),
-                BufferSemantic(AbstractSemantic(Semantic.TexCoord, 1), DXGIFormat.R16G16_FLOAT),
-                BufferSemantic(AbstractSemantic(Semantic.TexCoord, 2), DXGIFormat.R16G16_FLOAT),
-            ],
-        },
+        VertexBuffers=get_export_vertex_buffers(),
         ShapeKeyBuffers={
             'ShapeKeyOffset': [
                 BufferSemantic(AbstractSemantic(Semantic.RawData), DXGIFormat.R32G32B32A32_UINT),
@@ -151,6 +120,11 @@ def get_default_data_map():
                 BufferSemantic(AbstractSemantic(Semantic.RawData, 0), DXGIFormat.R16_FLOAT),
             ],
         },
+        BufferTransforms={
+            AbstractSemantic(Semantic.TexCoord, 0): lambda buffer, semantic, values: buffer.flip_component(semantic, 1, 1.0, values),
+            AbstractSemantic(Semantic.TexCoord, 1): lambda buffer, semantic, values: buffer.flip_component(semantic, 1, 1.0, values),
+            AbstractSemantic(Semantic.TexCoord, 2): lambda buffer, semantic, values: buffer.flip_component(semantic, 1, 1.0, values),
+        },
     )
 
 
@@ -276,9 +250,14 @@ def build_buffers(data_map, vertex_count, faces, vertex_cache, shapekey_offsets,
     # Build Vertex Buffers
     for name, semantics in data_map.VertexBuffers.items():
         vertex_buffer = ByteBuffer(BufferElementLayout(semantics))
-        vertex_buffer.extend(vertex_count)
-        for semantic in vertex_buffer.layout.semantics:
-            vertex_buffer.set_values(semantic.semantic, vertex_cache[semantic.semantic])
+        with vertex_buffer.batch():
+            vertex_buffer.extend(vertex_count)
+            for semantic in vertex_buffer.layout.semantics:
+                buffer_transform = data_map.BufferTransforms.get(semantic.semantic, None)
+                if buffer_transform is None:
+                    vertex_buffer.set_values(semantic.semantic, vertex_cache[semantic.semantic])
+                else:
+                    buffer_transform(vertex_buffer, semantic, vertex_cache[semantic.semantic])
         buffers[name] = vertex_buffer
 
     # Build Shape Key Buffers
@@ -391,8 +370,7 @@ def blender_export(operator, context, cfg, data_map):
             shutil.copy(texture.path, texture_path)
 
     for buffer_name, buffer in buffers.items():
-        with open(meshes_path / f'{buffer_name}.buf', "wb") as f:
-            f.write(buffer.get_bytes())
+        buffer.write_file(meshes_path / f'{buffer_name}.buf')
 
     if cfg.remove_temp_object:
         remove_object(obj)
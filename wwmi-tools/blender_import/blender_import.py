@@ -5,6 +5,7 @@ import itertools
 import time
 from pathlib import Path
 import re
+import numpy
 
 from array import array
 
@@ -261,7 +262,7 @@ def import_vertex_layers(mesh, obj, vertex_layers):
 def import_faces_from_ib(mesh, ib):
     mesh.loops.add(len(ib.faces) * 3)
     mesh.polygons.add(len(ib.faces))
-    mesh.loops.foreach_set('vertex_index', unpack_list(ib.faces))
+    mesh.loops.foreach_set('vertex_index', ib.faces.ravel().astype(numpy.int32))
     mesh.polygons.foreach_set('loop_start', [x * 3 for x in range(len(ib.faces))])
     mesh.polygons.foreach_set('loop_total', [3] * len(ib.faces))
 
@@ -28,6 +28,8 @@ snorm8_pattern = re.compile(r'''(?:DXGI_FORMAT_)?(?:[RGBAD]8)+_SNORM''')
 
 misc_float_pattern = re.compile(r'''(?:DXGI_FORMAT_)?(?:[RGBAD][0-9]+)+_(?:FLOAT|UNORM|SNORM)''')
 misc_int_pattern = re.compile(r'''(?:DXGI_FORMAT_)?(?:[RGBAD][0-9]+)+_[SU]INT''')
+# Matches first line of index data that doesn't consist of exactly 3 indices
+malformed_index_line_pattern = re.compile(r'''^(?![ \t]*\d+[ \t]+\d+[ \t]+\d+[ \t]*\r?$).*''', re.MULTILINE)
 
 
 def EncoderDecoder(fmt):
@@ -413,7 +415,9 @@ class VertexBuffer(object):
 
 class IndexBuffer(object):
     def __init__(self, *args, load_indices=True):
-        self.faces = []
+        self._faces = numpy.zeros((0, 3), dtype=numpy.int64)
+        # Faces added via append, converted to array at once on next faces access
+        self.appended_faces = []
         self.first = 0
         self.index_count = 0
         self.format = 'DXGI_FORMAT_UNKNOWN'
@@ -429,8 +433,21 @@ class IndexBuffer(object):
 
         self.encoder, self.decoder = EncoderDecoder(self.format)
 
+    @property
+    def faces(self):
+        if self.appended_faces:
+            appended_faces = numpy.array(self.appended_faces, dtype=numpy.int64).reshape(-1, 3)
+            self._faces = numpy.concatenate((self._faces, appended_faces))
+            self.appended_faces = []
+        return self._faces
+
+    @faces.setter
+    def faces(self, faces):
+        self._faces = faces
+        self.appended_faces = []
+
     def append(self, face):
-        self.faces.append(face)
+        self.appended_faces.append(face)
         self.index_count += len(face)
 
     def parse_ib_txt(self, f, load_indices):
@@ -460,16 +477,16 @@ class IndexBuffer(object):
         # f.seek(self.first * stride, whence=1)
         self.first = 0
 
-        face = []
-        while True:
-            index = f.read(stride)
-            if not index:
-                break
-            face.append(*self.decoder(index))
-            if len(face) == 3:
-                self.faces.append(tuple(face))
-                face = []
-        assert (len(face) == 0)
+        data = f.read()
+        assert (len(data) % stride == 0)
+        if u16_pattern.match(self.format):
+            indices = numpy.frombuffer(data, numpy.uint16)
+        elif u32_pattern.match(self.format):
+            indices = numpy.frombuffer(data, numpy.uint32)
+        else:
+            indices = numpy.array(self.decoder(data))
+        assert (len(indices) % 3 == 0)
+        self.faces = indices.astype(numpy.int64).reshape(-1, 3)
 
         # We intentionally disregard the index count when loading from a
         # binary file, as we assume frame analysis might have only dumped a
@@ -480,10 +497,16 @@ class IndexBuffer(object):
         self.index_count = len(self.faces) * 3
 
     def parse_index_data(self, f):
-        for line in map(str.strip, f):
-            face = tuple(map(int, line.split()))
-            assert (len(face) == 3)
-            self.faces.append(face)
+        # Rest of the file consists of whitespace separated indices only, so it can be parsed at once
+        data = f.read().rstrip()
+        if not data:
+            self.faces = numpy.zeros((0, 3), dtype=numpy.int64)
+            return
+        # Parsing at once skips line boundaries, so ensure that every line has exactly 3 indices beforehand
+        malformed_line = malformed_index_line_pattern.search(data)
+        if malformed_line is not None:
+            raise Fatal('Malformed index data line "%s", expected 3 indices' % malformed_line.group(0).strip())
+        self.faces = numpy.fromstring(data, dtype=numpy.int64, sep=' ').reshape(-1, 3)
 
     def merge(self, other):
         if self.format != other.format:
@@ -491,11 +514,10 @@ class IndexBuffer(object):
                 'Index buffers have different formats - ensure you are only trying to merge the same index buffer split across multiple draw calls')
         self.first = min(self.first, other.first)
         self.index_count += other.index_count
-        self.faces.extend(other.faces)
+        self.faces = numpy.concatenate((self.faces, other.faces))
 
     def write(self, output, operator=None):
-        for face in self.faces:
-            output.write(self.encoder(face))
+        output.write(self.encoder(self.faces.ravel()))
 
         msg = 'Wrote %i indices to %s' % (len(self), output.name)
         if operator:
@@ -504,9 +526,7 @@ class IndexBuffer(object):
             print(msg)
 
     def encode(self, ib_id):
-        result = bytearray()
-        for face in self.faces:
-            result += self.encoder(face)
+        result = bytearray(self.encoder(self.faces.ravel()))
         print(f'Encoded {len(self)} indices for {ib_id}')
         return result
 
@@ -1,5 +1,4 @@
 import logging
-import copy
 
 from dataclasses import dataclass, field
 from typing import List, Dict
@@ -109,28 +108,26 @@ class MeshObject:
             # Fetch associated shapekeys data
             shapekey_buffer = self.shapekey_data.build_shapekey_buffer(draw_data.vertex_offset, draw_data.vertex_count)
             if shapekey_buffer is not None:
-                # Copy VB layout and merge it with layout of shapekeys buffer
-                vb_layout = copy.deepcopy(vb_layout)
-                vb_layout.merge(shapekey_buffer.layout)
+                # Extend VB layout with layout of shapekeys buffer
+                vb_layout = vb_layout.merge(shapekey_buffer.layout)
 
         vb = ByteBuffer(vb_layout)
-        vb.extend(draw_data.vertex_count)
 
-        vb.import_buffer(draw_data.position_buffer)
-        vb.import_buffer(draw_data.vector_buffer)
-        vb.import_buffer(draw_data.texcoord_buffer)
-        if draw_data.color_buffer is not None:
-            vb.import_buffer(draw_data.color_buffer)
-        vb.import_buffer(draw_data.blend_buffer)
+        with vb.batch():
+            vb.extend(draw_data.vertex_count)
 
-        if shapekey_buffer is not None:
-            vb.import_buffer(shapekey_buffer)
+            vb.import_buffer(draw_data.position_buffer)
+            vb.import_buffer(draw_data.vector_buffer)
+            vb.import_buffer(draw_data.texcoord_buffer)
+            if draw_data.color_buffer is not None:
+                vb.import_buffer(draw_data.color_buffer)
+            vb.import_buffer(draw_data.blend_buffer)
+
+            if shapekey_buffer is not None:
+                vb.import_buffer(shapekey_buffer)
 
         # Decrease vertex ids in IB by component offset to make them start from 0
-        draw_data.index_buffer.faces = [
-            tuple(vertex_index - draw_data.vertex_offset for vertex_index in face)
-            for face in draw_data.index_buffer.faces
-        ]
+        draw_data.index_buffer.faces = draw_data.index_buffer.faces - draw_data.vertex_offset
 
         textures = {}
         for texture in draw_data.textures:
@@ -163,11 +160,11 @@ class MeshObject:
         for component_id, component in enumerate(self.components):
             vg_map[component_id] = {}
             # Fetch joined list of all VG ids of all vertices of the component (4 VG ids per vertex)
-            vertex_groups = component.vertex_buffer.get_values(AbstractSemantic(Semantic.Blendindices))
+            vertex_groups = component.vertex_buffer.get_array(AbstractSemantic(Semantic.Blendindices))
             # For remapping purposes, VG count is the highest used VG id among all vertices of the component
             # It allows to efficiently construct merged skeleton buffer in-game via vg_offset & vg_count of components
             component.vg_offset = vg_offset
-            component.vg_count = max(vertex_groups) + 1
+            component.vg_count = int(vertex_groups.max()) + 1
             # Ensure frame dump data integrity
             if component.skeleton_buffer.num_elements < component.vg_count:
                 raise ValueError('skeleton of Component_%d has only %d bones, while there are %d VGs declared' % (
@@ -138,9 +138,8 @@ class DataExtractor:
 
                 vb_hash = branch_call.resources['POSE_INPUT_0'].hash
 
-                vertex_indices = [x for y in index_buffer.faces for x in y]
-                vertex_offset = min(vertex_indices)
-                vertex_count = max(vertex_indices) - vertex_offset + 1
+                vertex_offset = int(index_buffer.faces.min())
+                vertex_count = int(index_buffer.faces.max()) - vertex_offset + 1
 
                 draw_guid = (vertex_offset, vertex_count, vb_hash)
 
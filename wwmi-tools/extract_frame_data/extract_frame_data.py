@@ -13,6 +13,7 @@ from ..migoto_io.blender_interface.utility import *
 
 from ..migoto_io.buffers.dxgi_format import DXGIFormat
 from ..migoto_io.buffers.byte_buffer import BufferElementLayout, BufferSemantic, AbstractSemantic, Semantic, ByteBuffer
+from ..migoto_io.buffers.wwmi_layouts import extract_vb_layout
 
 from ..migoto_io.dump_parser.filename_parser import ShaderType, SlotType, SlotId
 from ..migoto_io.dump_parser.dump_parser import Dump
@@ -175,18 +176,7 @@ configuration = Configuration(
         'TEXTURE_8': DataMap([Source('DRAW_VS', ShaderType.Pixel, SlotType.Texture, SlotId(8), ignore_missing=True)]),
         
     },
-    output_vb_layout=BufferElementLayout([
-        BufferSemantic(AbstractSemantic(Semantic.Position, 0), DXGIFormat.R32G32B32_FLOAT),
-        BufferSemantic(AbstractSemantic(Semantic.Tangent, 0), DXGIFormat.R8G8B8A8_SNORM),
-        BufferSemantic(AbstractSemantic(Semantic.Normal, 0), DXGIFormat.R8G8B8A8_SNORM),
-        BufferSemantic(AbstractSemantic(Semantic.Blendindices, 0), DXGIFormat.R8G8B8A8_UINT),
-        BufferSemantic(AbstractSemantic(Semantic.Blendweight, 0), DXGIFormat.R8G8B8A8_UNORM),
-        BufferSemantic(AbstractSemantic(Semantic.Color, 0), DXGIFormat.R8G8B8A8_UNORM),
-        BufferSemantic(AbstractSemantic(Semantic.TexCoord, 0), DXGIFormat.R16G16_FLOAT),
-        BufferSemantic(AbstractSemantic(Semantic.Color, 1), DXGIFormat.R16G16_UNORM),
-        BufferSemantic(AbstractSemantic(Semantic.TexCoord, 1), DXGIFormat.R16G16_FLOAT),
-        BufferSemantic(AbstractSemantic(Semantic.TexCoord, 2), DXGIFormat.R16G16_FLOAT),
-    ]),
+    output_vb_layout=extract_vb_layout,
 )
 
 
@@ -209,10 +199,8 @@ def write_objects(output_directory, objects):
             component_filename = f'Component {component_id}'
 
             # Write buffers
-            with open(object_directory / f'{component_filename}.ib', "wb") as f:
-                f.write(component.ib)
-            with open(object_directory / f'{component_filename}.vb', "wb") as f:
-                f.write(component.vb)
+            component.ib.write_file(object_directory / f'{component_filename}.ib')
+            component.vb.write_file(object_directory / f'{component_filename}.vb')
             with open(object_directory / f'{component_filename}.fmt', "w") as f:
                 f.write(component.fmt)
 
@@ -261,7 +249,8 @@ def extract_frame_data(cfg):
     frame_data = DataCollector(
         dump=dump,
         shader_data_pattern=configuration.shader_data_pattern,
-        shader_resources=configuration.shader_resources
+        shader_resources=configuration.shader_resources,
+        num_threads=os.cpu_count() or 1,
     )
 
     # Extract mesh objects data from data view
@@ -4,9 +4,9 @@ import json
 
 from dataclasses import dataclass, field
 from typing import List, Dict
-from pathlib import Path
 
 from ..migoto_io.buffers.dxgi_format import DXGIFormat
+from ..migoto_io.buffers.byte_buffer import ByteBuffer, IndexBuffer
 from ..migoto_io.dump_parser.filename_parser import ResourceDescriptor
 
 from .shapekey_builder import ShapeKeys
@@ -24,8 +24,8 @@ class TextureFilter:
 @dataclass
 class ComponentData:
     fmt: str
-    vb: bytearray
-    ib: bytearray
+    vb: ByteBuffer
+    ib: IndexBuffer
     textures: Dict[str, List[ResourceDescriptor]]
 
 
@@ -60,8 +60,8 @@ class OutputBuilder:
                 components=[
                     ComponentData(
                         fmt=self.build_fmt(component.vertex_buffer, component.index_buffer),
-                        vb=component.vertex_buffer.get_bytes(),
-                        ib=component.index_buffer.get_bytes(),
+                        vb=component.vertex_buffer,
+                        ib=component.index_buffer,
                         textures=component.textures,
                     ) for component in mesh_object.components
                 ]
@@ -94,8 +94,7 @@ class OutputBuilder:
                     
                 # Exclude texture below minimal file size 
                 if self.texture_filter.min_file_size != 0:
-                    file_size = Path(texture.path).stat().st_size
-                    if file_size < self.texture_filter.min_file_size:
+                    if texture.get_len() < self.texture_filter.min_file_size:
                         continue
 
                 # Exclude texture if it has same slot+hash in all components
@@ -0,0 +1,241 @@
+"""
+Standalone micro-benchmark of ByteBuffer operations and DXGI codecs, runs without Blender:
+
+    cd wwmi-tools
+    python -m migoto_io.buffers.benchmark --save baseline.json
+    python -m migoto_io.buffers.benchmark --baseline baseline.json
+
+Exits with code 1 if any operation got slower than baseline by more than tolerance.
+"""
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy
+
+from dataclasses import dataclass, asdict
+from typing import Dict
+
+from .dxgi_format import DXGIFormat, decode_normalized
+from .byte_buffer import ByteBuffer, BufferElementLayout, BufferSemantic
+from .wwmi_layouts import extract_vb_layout, get_export_vertex_buffers
+
+
+def get_benchmark_layouts():
+    """
+    Returns layouts of .vb files written by frame data extraction and .buf files written by mod export
+    """
+    layouts = {'extract_vb': extract_vb_layout}
+    for buffer_name, semantics in get_export_vertex_buffers().items():
+        layouts[f'export_{buffer_name.lower()}'] = BufferElementLayout(semantics)
+    return layouts
+
+
+def get_float_layout(layout):
+    """
+    Returns layout with all semantics stored as 32-bit floats, used to benchmark format conversion on import
+    """
+    float_formats = {
+        1: DXGIFormat.R32_FLOAT,
+        2: DXGIFormat.R32G32_FLOAT,
+        3: DXGIFormat.R32G32B32_FLOAT,
+        4: DXGIFormat.R32G32B32A32_FLOAT,
+    }
+    return BufferElementLayout([
+        BufferSemantic(semantic.semantic, float_formats[semantic.get_num_values()])
+        for semantic in layout.semantics
+    ])
+
+
+def generate_values(rng, dxgi_format, shape):
+    """
+    Returns random values within valid range of given format, so float codecs process realistic data
+    """
+    if dxgi_format.array_decoder is decode_normalized:
+        if numpy.dtype(dxgi_format.dtype).kind == 'u':
+            return rng.random(shape)
+        return rng.uniform(-1.0, 1.0, shape)
+    if numpy.dtype(dxgi_format.dtype).kind == 'f':
+        return rng.uniform(-1.0, 1.0, shape)
+    return rng.integers(0, min(numpy.iinfo(dxgi_format.dtype).max, 255) + 1, shape)
+
+
+def generate_buffer(layout, num_elements, seed=0):
+    rng = numpy.random.default_rng(seed)
+    byte_buffer = ByteBuffer(layout)
+    with byte_buffer.batch():
+        byte_buffer.extend(num_elements)
+        for semantic in layout.semantics:
+            values = generate_values(rng, semantic.format, (num_elements, semantic.get_num_values()))
+            byte_buffer.set_array(semantic, values)
+    return byte_buffer
+
+
+@dataclass
+class BenchmarkResult:
+    seconds: float
+    mb_s: float
+    rows_s: float
+
+
+def measure(func, num_bytes, num_rows, repeat):
+    """
+    Returns best of 'repeat' timings of provided function along with its throughput
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    best = max(best, 1e-9)
+    return BenchmarkResult(
+        seconds=best,
+        mb_s=num_bytes / best / 1024 / 1024,
+        rows_s=num_rows / best,
+    )
+
+
+def benchmark_layout(layout, num_elements, repeat):
+    """
+    Returns timings of ByteBuffer operations for synthetic buffer of given layout and size
+    """
+    source = generate_buffer(layout, num_elements)
+    data_bytes = source.get_bytes()
+    num_bytes = len(data_bytes)
+    # Float copy of source holds values within range of its formats, so encoding them back can't overflow
+    float_source = ByteBuffer(get_float_layout(layout))
+    float_source.extend(num_elements)
+    float_source.import_buffer(source)
+    indices = numpy.random.default_rng(0).permutation(num_elements)
+
+    def import_buffer(src_byte_buffer):
+        byte_buffer = ByteBuffer(layout)
+        byte_buffer.extend(num_elements)
+        byte_buffer.import_buffer(src_byte_buffer)
+
+    def decode_semantics():
+        for semantic in layout.semantics:
+            source.get_array(semantic)
+
+    def encode_semantics():
+        byte_buffer = ByteBuffer(layout)
+        with byte_buffer.batch():
+            byte_buffer.extend(num_elements)
+            for semantic in layout.semantics:
+                byte_buffer.set_array(semantic, float_source.get_array(semantic.semantic))
+
+    operations = {
+        'from_bytes': lambda: ByteBuffer(layout, bytearray(data_bytes)),
+        'get_bytes': lambda: source.get_bytes(),
+        'write_to': lambda: source.write_to(io.BytesIO()),
+        'get_fragment': lambda: source.get_fragment(num_elements // 4, num_elements // 2).get_bytes(),
+        'import_buffer': lambda: import_buffer(source),
+        'import_buffer_convert': lambda: import_buffer(float_source),
+        'take': lambda: source.take(indices),
+        'concat': lambda: ByteBuffer.concat([source, source]),
+        'decode': decode_semantics,
+        'encode': encode_semantics,
+        'fingerprint': lambda: ByteBuffer(layout, bytearray(data_bytes)).get_fingerprint(),
+    }
+
+    return {name: measure(func, num_bytes, num_elements, repeat) for name, func in operations.items()}
+
+
+def benchmark_codecs(num_values, repeat):
+    """
+    Returns timings of array codecs of every DXGIEncoderDecoder for given number of values
+    """
+    rng = numpy.random.default_rng(0)
+    results = {}
+    for dxgi_format in DXGIFormat:
+        # Single-component format of every codec is enough, as codecs don't depend on number of components
+        if dxgi_format.get_num_values() != 1:
+            continue
+        values = generate_values(rng, dxgi_format, num_values)
+        data = dxgi_format.encode_array(values)
+        num_bytes = data.nbytes
+        results[f'{dxgi_format.format}/encode'] = measure(lambda: dxgi_format.encode_array(values), num_bytes, num_values, repeat)
+        results[f'{dxgi_format.format}/decode'] = measure(lambda: dxgi_format.decode_array(data), num_bytes, num_values, repeat)
+    return results
+
+
+def run_benchmarks(sizes, repeat):
+    results = {}
+    for layout_name, layout in get_benchmark_layouts().items():
+        for num_elements in sizes:
+            for operation, result in benchmark_layout(layout, num_elements, repeat).items():
+                results[f'{layout_name}/{num_elements}/{operation}'] = result
+    for num_values in sizes:
+        for operation, result in benchmark_codecs(num_values, repeat).items():
+            results[f'codec/{num_values}/{operation}'] = result
+    return results
+
+
+def compare_results(results: Dict[str, BenchmarkResult], baseline, tolerance):
+    """
+    Returns list of benchmark names that got slower than baseline by more than tolerance
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get(name, None)
+        if baseline_result is None:
+            continue
+        if result.seconds > baseline_result['seconds'] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def format_results(results: Dict[str, BenchmarkResult], baseline=None):
+    lines = [f'{"benchmark":<56} {"ms":>10} {"MB/s":>10} {"rows/s":>14} {"vs base":>8}']
+    for name, result in results.items():
+        line = f'{name:<56} {result.seconds * 1000:>10.3f} {result.mb_s:>10.1f} {result.rows_s:>14.0f}'
+        if baseline is not None and name in baseline:
+            line += f' {result.seconds / baseline[name]["seconds"]:>8.2f}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmark migoto_io.buffers ByteBuffer operations and DXGI codecs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='number of vertices of synthetic buffers')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs of each operation, best one is reported')
+    parser.add_argument('--baseline', help='path to JSON with results of previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='allowed slowdown relative to baseline before it is reported as regression')
+    parser.add_argument('--save', help='path to write JSON with results of this run')
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(args.sizes, args.repeat)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+
+    print(format_results(results, baseline))
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': numpy.__version__,
+                'platform': platform.platform(),
+                'results': {name: asdict(result) for name, result in results.items()},
+            }, f, indent=4)
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, args.tolerance)
+        if len(regressions) > 0:
+            print(f'\n{len(regressions)} benchmarks are slower than baseline by more than {args.tolerance:.0%}:')
+            for name in regressions:
+                print(f'  {name}')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
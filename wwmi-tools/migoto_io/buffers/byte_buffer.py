@@ -1,11 +1,18 @@
 
 import io
-import copy
+import os
+import re
+import hashlib
 import textwrap
 import math
-
-from typing import Union, List
-from dataclasses import dataclass
+import numpy
+
+from typing import Union, List, Tuple, Dict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from types import MappingProxyType
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from .dxgi_format import *
@@ -31,17 +38,22 @@ class Semantic(Enum):
         return f'{self.value}'
 
 
-@dataclass
+@dataclass(frozen=True)
 class AbstractSemantic:
     semantic: Semantic
     index: int = 0
 
     def __init__(self, semantic, semantic_index=0):
-        self.semantic = semantic
-        self.index = semantic_index
+        object.__setattr__(self, 'semantic', semantic)
+        object.__setattr__(self, 'index', semantic_index)
+        object.__setattr__(self, '_hash', hash((semantic, semantic_index)))
 
     def __hash__(self):
-        return hash((self.semantic, self.index))
+        return self._hash
+
+    def __reduce__(self):
+        # Cached hash depends on string hash seed of process, so unpickled copies must calculate their own
+        return AbstractSemantic, (self.semantic, self.index)
 
     def __str__(self):
         return f'{self.semantic}_{self.index}'
@@ -58,7 +70,7 @@ class AbstractSemantic:
         return name
 
 
-@dataclass
+@dataclass(frozen=True)
 class BufferSemantic:
     semantic: AbstractSemantic
     format: DXGIFormat
@@ -68,10 +80,15 @@ class BufferSemantic:
     def __post_init__(self):
         # Calculate byte stride
         if self.stride == 0:
-            self.stride = self.format.byte_width
+            object.__setattr__(self, 'stride', self.format.byte_width)
+        object.__setattr__(self, '_hash', hash((self.semantic, self.format.format, self.stride, self.offset)))
 
     def __hash__(self):
-        return hash((self.semantic, self.format.format, self.stride, self.offset))
+        return self._hash
+
+    def __reduce__(self):
+        # Cached hash depends on string hash seed of process, so unpickled copies must calculate their own
+        return BufferSemantic, (self.semantic, self.format, self.stride, self.offset)
 
     def __repr__(self):
         return f'{self.semantic} ({self.format.format} size={self.stride} offset={self.offset})'
@@ -90,49 +107,136 @@ class BufferSemantic:
     def get_format(self):
         return self.format.get_format()
 
-@dataclass
+    def get_num_values(self):
+        return self.format.get_num_values(self.stride)
+
+    def get_numpy_type(self):
+        return self.format.dtype, (self.get_num_values(),)
+
+
+@dataclass(frozen=True)
+class CompiledLayout:
+    """
+    Immutable lookup tables of BufferElementLayout, shared between all layouts with identical semantics
+    """
+    elements: Dict[AbstractSemantic, BufferSemantic]
+    field_names: Dict[AbstractSemantic, str]
+    offsets: Dict[AbstractSemantic, int]
+    strides: Dict[AbstractSemantic, int]
+    dtype: numpy.dtype
+
+    @classmethod
+    def compile(cls, semantics, stride):
+        elements, field_names, offsets, strides = {}, {}, {}, {}
+        offset = 0
+        for semantic in semantics:
+            # Keep first entry of duplicate semantic, same as linear search did
+            if semantic.semantic not in elements:
+                elements[semantic.semantic] = semantic
+                field_names[semantic.semantic] = str(semantic.semantic)
+                offsets[semantic.semantic] = offset
+                strides[semantic.semantic] = semantic.stride
+            offset += semantic.stride
+        if offset > stride:
+            raise ValueError(f'layout mismatch: semantics end at {offset} instead of {stride}')
+        if len(elements) != len(semantics):
+            # Structured dtype cannot hold duplicate fields, such layout can be used only to describe data
+            dtype = None
+        else:
+            dtype = numpy.dtype({
+                'names': list(field_names.values()),
+                'formats': [semantic.get_numpy_type() for semantic in semantics],
+                'offsets': list(offsets.values()),
+                'itemsize': stride,
+            })
+        return cls(
+            elements=MappingProxyType(elements),
+            field_names=MappingProxyType(field_names),
+            offsets=MappingProxyType(offsets),
+            strides=MappingProxyType(strides),
+            dtype=dtype,
+        )
+
+
+compiled_layouts = {}
+
+
+@dataclass(frozen=True)
 class BufferElementLayout:
-    semantics: List[BufferSemantic]
+    semantics: Tuple[BufferSemantic, ...]
     stride: int = 0
     force_stride: bool = False
 
     def __post_init__(self):
+        semantics = list(self.semantics)
+        stride = self.stride
         # Autofill byte Stride and Offsets
-        if self.stride == 0:
+        if stride == 0:
             # Calculate byte stride
-            for element in self.semantics:
-                self.stride += element.stride
+            for element in semantics:
+                stride += element.stride
             # Calculate byte offsets
             offset = 0
-            for element in self.semantics:
-                element.offset = offset
+            for element_id, element in enumerate(semantics):
+                semantics[element_id] = replace(element, offset=offset)
                 offset += element.stride
         # Autofill Semantic Index
         groups = {}
-        for semantic in self.semantics:
+        for element_id, semantic in enumerate(semantics):
             if semantic not in groups:
                 groups[semantic] = 0
                 continue
             if semantic.semantic.index == 0:
                 groups[semantic] += 1
-                semantic.semantic.index = groups[semantic]
+                semantics[element_id] = replace(semantic, semantic=AbstractSemantic(semantic.semantic.semantic, groups[semantic]))
+        object.__setattr__(self, 'semantics', tuple(semantics))
+        object.__setattr__(self, 'stride', stride)
+        # Intern compiled lookup tables, so identical layouts would share them
+        key = (self.semantics, self.stride)
+        compiled = compiled_layouts.get(key, None)
+        if compiled is None:
+            compiled = CompiledLayout.compile(self.semantics, self.stride)
+            compiled_layouts[key] = compiled
+        object.__setattr__(self, 'compiled', compiled)
+
+    def __reduce__(self):
+        # Rebuild copies from fields, so they would get interned lookup tables instead of copying them
+        return BufferElementLayout, (self.semantics, self.stride, self.force_stride)
 
     def get_element(self, semantic):
-        for element in self.semantics:
-            if semantic == element.semantic:
-                return element
+        return self.compiled.elements.get(semantic, None)
+
+    def has_element(self, semantic):
+        return self.compiled.elements.get(semantic.semantic, None) == semantic
+
+    def get_field_name(self, semantic):
+        return self.compiled.field_names[semantic.semantic]
 
     def add_element(self, semantic):
-        semantic = copy.deepcopy(semantic)
-        semantic.offset = self.stride
-        self.semantics.append(semantic)
-        self.stride += semantic.stride
+        """
+        Returns new layout with provided semantic appended to the end of the element
+        """
+        semantic = replace(semantic, offset=self.stride)
+        return BufferElementLayout(self.semantics + (semantic,), self.stride + semantic.stride, self.force_stride)
 
     def merge(self, layout):
-
+        """
+        Returns new layout with semantics of provided layout missing from this one appended to the end of the element
+        """
+        merged_layout = self
         for semantic in layout.semantics:
-            if not self.get_element(semantic):
-                self.add_element(semantic)
+            if not merged_layout.get_element(semantic.semantic):
+                merged_layout = merged_layout.add_element(semantic)
+        return merged_layout
+
+    def get_numpy_type(self):
+        """
+        Returns numpy structured dtype describing single element of the buffer
+        Fields are packed in order of semantics (matching byte layout of the buffer) and named after abstract semantics
+        """
+        if self.compiled.dtype is None:
+            raise ValueError(f'layout has duplicate semantics: {self.semantics}')
+        return self.compiled.dtype
 
     def to_string(self):
         ret = ''
@@ -142,6 +246,16 @@ class BufferElementLayout:
         return ret
 
 
+@dataclass(frozen=True)
+class SharedBufferDescriptor:
+    """
+    Picklable description of ByteBuffer elements stored in shared memory block
+    """
+    name: str
+    layout: BufferElementLayout
+    num_elements: int
+
+
 class BufferElement:
     def __init__(self, buffer, index):
         self.buffer = buffer
@@ -151,8 +265,7 @@ class BufferElement:
     def get_bytes(self, semantic, return_buffer_semantic=False):
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        byte_offset = self.index * semantic.stride
-        data_bytes = self.buffer.data[semantic][byte_offset : byte_offset + semantic.stride]
+        data_bytes = self.buffer.data[semantic][self.index].tobytes()
         if not return_buffer_semantic:
             return data_bytes
         else:
@@ -161,19 +274,17 @@ class BufferElement:
     def set_bytes(self, semantic, data_bytes):
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        byte_offset = self.index * semantic.stride
-        self.buffer.data[semantic][byte_offset: byte_offset + semantic.stride] = data_bytes
+        self.buffer.get_writable_array(semantic)[self.index] = numpy.frombuffer(data_bytes, semantic.format.dtype)
 
     def get_value(self, semantic):
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        data_bytes = self.get_bytes(semantic)
-        return semantic.format.decoder(data_bytes)
+        return semantic.format.decode_array(self.buffer.data[semantic][self.index]).tolist()
 
     def set_value(self, semantic, value):
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        self.set_bytes(semantic, semantic.format.encoder(value))
+        self.buffer.get_writable_array(semantic)[self.index] = semantic.format.encode_array(value)
 
     def get_all_bytes(self):
         data_bytes = bytearray()
@@ -182,21 +293,54 @@ class BufferElement:
         return data_bytes
 
 
+# Fingerprints of buffers written by `ByteBuffer.write_file` along with size, mtime and ctime of written files
+# Entries are kept in order of last use, so the least recently used ones get evicted once the limit is reached
+written_files = {}
+written_files_limit = 4096
+
+
+def get_file_stat(file_path):
+    """
+    Returns size, mtime and ctime of file, or None if it doesn't exist
+    Setting mtime back also updates ctime, so file rewritten by another process won't pass as unchanged
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+
+
 class ByteBuffer:
-    def __init__(self, layout, data_bytes=None):
+    def __init__(self, layout, data_bytes=None, file_path=None):
         self.layout = None
         self.data = {}
         self.num_elements = 0
+        self.batch_depth = 0
+        self.shared_memory = None
+        self.fingerprints = {}
 
         self.update_layout(layout)
 
         if data_bytes is not None:
             self.from_bytes(data_bytes)
+        elif file_path is not None:
+            self.from_file(file_path)
 
-    def validate(self):
+    def validate(self, semantic=None):
+        """
+        Ensures that data of all semantics has the same number of elements and updates 'num_elements'
+        With 'semantic' provided, only its data length is compared with 'num_elements' if the rest is known to be valid
+        Does nothing within `batch()` context, as validation is deferred until exit
+        """
+        if self.batch_depth > 0:
+            return
+        if semantic is not None and len(self.data) == len(self.layout.semantics):
+            if len(self.data[semantic]) == self.num_elements:
+                return
         num_elements = {}
         for semantic in self.layout.semantics:
-            num_elements[semantic] = len(self.data[semantic]) / semantic.stride
+            num_elements[semantic] = len(self.data[semantic])
         if min(num_elements.values()) != max(num_elements.values()):
             num_elements = ', '.join([f'{k.semantic}: {v}' for k, v in num_elements.items()])
             raise ValueError(f'elements count mismatch in buffers: {num_elements}')
@@ -204,6 +348,18 @@ class ByteBuffer:
             raise ValueError(f'data structure must match buffer layout!')
         self.num_elements = int(min(num_elements.values()))
 
+    @contextmanager
+    def batch(self):
+        """
+        Suspends validation of buffer mutations made within the context, consistency is validated once on exit
+        """
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+        self.validate()
+
     def update_layout(self, layout):
         self.layout = layout
         if len(self.data) != 0:
@@ -213,25 +369,87 @@ class ByteBuffer:
         if self.layout.force_stride:
             data_bytes.extend(bytearray((math.ceil(len(data_bytes) / self.layout.stride)) * self.layout.stride - len(data_bytes)))
 
-        num_elements = len(data_bytes) / self.layout.stride
-        if num_elements % 1 != 0:
+        if len(data_bytes) % self.layout.stride != 0:
             raise ValueError(f'buffer stride {self.layout.stride} must be multiplier of bytes len {len(data_bytes)}')
-        num_elements = int(num_elements)
+
+        # Map input bytes to single record array and store per-semantic views of it
+        # Views are shared with input bytes, so data will be copied only on first in-place write
+        records = self.share_array(numpy.frombuffer(data_bytes, self.layout.get_numpy_type()))
 
         self.data = {}
+        self.fingerprints = {}
         for semantic in self.layout.semantics:
-            self.data[semantic] = bytearray()
+            self.data[semantic] = records[self.layout.get_field_name(semantic)]
 
-        byte_offset = 0
-        for element_id in range(num_elements):
-            for semantic in self.layout.semantics:
-                self.data[semantic].extend(data_bytes[byte_offset:byte_offset+semantic.stride])
-                byte_offset += semantic.stride
+        # All views have the same length by design, no need to validate them
+        self.num_elements = len(records)
 
-        if byte_offset != len(data_bytes):
-            raise ValueError(f'layout mismatch: input ended at {byte_offset} instead of {len(data_bytes)}')
+    def from_file(self, file_path):
+        """
+        Maps buffer file to memory read-only, so only accessed elements are paged in from disk
+        Data will be copied to memory only on first in-place write
+        """
+        file_size = os.path.getsize(file_path)
 
-        self.validate()
+        # Memory map cannot be padded or be empty, such files are small enough to be read as is
+        if file_size == 0 or (self.layout.force_stride and file_size % self.layout.stride != 0):
+            with open(file_path, 'rb') as f:
+                self.from_bytes(bytearray(f.read()))
+            return
+
+        if file_size % self.layout.stride != 0:
+            raise ValueError(f'buffer stride {self.layout.stride} must be multiplier of bytes len {file_size}')
+
+        records = numpy.memmap(file_path, dtype=self.layout.get_numpy_type(), mode='r')
+
+        self.data = {}
+        self.fingerprints = {}
+        for semantic in self.layout.semantics:
+            self.data[semantic] = records[self.layout.get_field_name(semantic)].view(numpy.ndarray)
+
+        self.num_elements = len(records)
+
+    def to_shared_memory(self):
+        """
+        Returns new shared memory block with interleaved elements and descriptor to attach to it from other processes
+        Block must be closed and unlinked by caller once it's no longer needed
+        """
+        size = self.num_elements * self.layout.stride
+        shared_memory = SharedMemory(create=True, size=max(size, 1))
+        if size > 0:
+            self.interleave(shared_memory.buf[:size])
+        return shared_memory, SharedBufferDescriptor(shared_memory.name, self.layout, self.num_elements)
+
+    @classmethod
+    def from_shared_memory(cls, descriptor):
+        """
+        Returns buffer with views of elements stored in shared memory block, data will be copied only on first in-place write
+        Views must not outlive the buffer, call `detach` to copy shared data and close the block before that
+        """
+        byte_buffer = cls(descriptor.layout)
+        byte_buffer.shared_memory = SharedMemory(name=descriptor.name)
+
+        records = numpy.frombuffer(byte_buffer.shared_memory.buf, descriptor.layout.get_numpy_type(),
+                                   count=descriptor.num_elements)
+        records = byte_buffer.share_array(records)
+
+        for semantic in descriptor.layout.semantics:
+            byte_buffer.data[semantic] = records[descriptor.layout.get_field_name(semantic)]
+        byte_buffer.num_elements = descriptor.num_elements
+
+        return byte_buffer
+
+    def detach(self):
+        """
+        Copies data still shared with attached shared memory block and closes the block
+        """
+        if self.shared_memory is None:
+            return
+        for semantic in self.layout.semantics:
+            if semantic in self.data:
+                self.get_writable_array(semantic)
+        self.shared_memory.close()
+        self.shared_memory = None
 
     def get_element(self, index):
         return BufferElement(self, index)
@@ -240,18 +458,24 @@ class ByteBuffer:
         if num_elements <= 0:
             raise ValueError(f'cannot extend buffer by {num_elements} elements')
         for semantic in self.layout.semantics:
+            dtype, shape = semantic.get_numpy_type()
+            data = numpy.zeros((num_elements, *shape), dtype)
             if semantic in self.data:
-                self.data[semantic].extend(bytearray(num_elements * semantic.stride))
+                self.data[semantic] = numpy.concatenate((self.data[semantic], data))
             else:
-                self.data[semantic] = bytearray(num_elements * semantic.stride)
+                self.data[semantic] = data
+            self.fingerprints.pop(semantic, None)
+        if len(self.data) == len(self.layout.semantics):
+            self.num_elements += num_elements
         self.validate()
 
     def get_fragment(self, offset, element_count):
+        """
+        Returns buffer with views of given range of elements, data will be copied only on first in-place write
+        """
         fragment = ByteBuffer(self.layout)
         for semantic in self.layout.semantics:
-            byte_offset = offset * semantic.stride
-            byte_count = element_count * semantic.stride
-            fragment.data[semantic] = self.data[semantic][byte_offset:byte_offset+byte_count]
+            fragment.data[semantic] = self.share_array(self.data[semantic])[offset:offset+element_count]
         fragment.validate()
         return fragment
 
@@ -272,40 +496,285 @@ class ByteBuffer:
         # Import data bytes
         for src_semantic, dst_semantic in semantic_map.items():
             if src_semantic.format == dst_semantic.format:
-                self.data[dst_semantic] = src_byte_buffer.data[src_semantic]
+                self.data[dst_semantic] = self.share_array(src_byte_buffer.data[src_semantic])
             else:
-                src_values = src_semantic.format.decoder(src_byte_buffer.data[src_semantic])
-                self.data[dst_semantic] = dst_semantic.format.encoder(src_values)
+                self.data[dst_semantic] = self.convert_array(src_semantic, dst_semantic, src_byte_buffer.data[src_semantic])
+            self.fingerprints.pop(dst_semantic, None)
+            self.validate(dst_semantic)
 
-        self.validate()
+    def take(self, indices):
+        """
+        Returns new buffer with elements gathered from provided element indices, indices may repeat
+        """
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        if indices.ndim != 1:
+            raise ValueError(f'cannot take elements by {indices.ndim}-dimensional indices')
+        result = ByteBuffer(self.layout)
+        for semantic in self.layout.semantics:
+            result.data[semantic] = self.data[semantic].take(indices, axis=0)
+        result.num_elements = len(indices)
+        return result
+
+    @staticmethod
+    def concat(byte_buffers):
+        """
+        Returns new buffer with elements of provided buffers of the same layout written one after another
+        """
+        if len(byte_buffers) == 0:
+            raise ValueError('cannot concatenate empty list of buffers')
+        layout = byte_buffers[0].layout
+        for byte_buffer in byte_buffers:
+            if byte_buffer.layout != layout:
+                raise ValueError('cannot concatenate buffers with different layouts')
+        result = ByteBuffer(layout)
+        result.num_elements = sum(byte_buffer.num_elements for byte_buffer in byte_buffers)
+        for semantic in layout.semantics:
+            dtype, shape = semantic.get_numpy_type()
+            data = numpy.empty((result.num_elements, *shape), dtype)
+            offset = 0
+            for byte_buffer in byte_buffers:
+                data[offset:offset+byte_buffer.num_elements] = byte_buffer.data[semantic]
+                offset += byte_buffer.num_elements
+            result.data[semantic] = data
+        return result
+
+    def scatter(self, indices, src_byte_buffer, semantic_map=None, skip_missing=False):
+        """
+        Writes elements of source buffer to provided element indices of this buffer based on their semantics
+        Semantics are mapped the same way as in `import_buffer`, with data converted to destination format if needed
+        """
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        if indices.shape != (src_byte_buffer.num_elements,):
+            raise ValueError(f'indices shape {indices.shape} differs from source buffer len {src_byte_buffer.num_elements}')
+
+        semantic_map = self.map_semantics(src_byte_buffer, self, semantic_map=semantic_map, skip_missing=skip_missing)
+
+        for src_semantic, dst_semantic in semantic_map.items():
+            data = src_byte_buffer.data[src_semantic]
+            if src_semantic.format != dst_semantic.format:
+                data = self.convert_array(src_semantic, dst_semantic, data)
+            self.get_writable_array(dst_semantic)[indices] = data
 
     def get_bytes(self, semantic=None):
         if semantic is None:
-            data_bytes = bytearray()
-            for element_id in range(self.num_elements):
-                data_bytes.extend(self.get_element(element_id).get_all_bytes())
+            data_bytes = bytearray(self.num_elements * self.layout.stride)
+            self.interleave(data_bytes)
             return data_bytes
         else:
             if isinstance(semantic, AbstractSemantic):
                 semantic = self.layout.get_element(semantic)
-            return self.data[semantic]
+            return self.data[semantic].tobytes()
+
+    def interleave(self, data_bytes, first_element=0):
+        """
+        Writes elements starting from 'first_element' into provided writable bytes-like object
+        Number of written elements is defined by length of 'data_bytes', which must be multiplier of layout stride
+        """
+        if len(data_bytes) % self.layout.stride != 0:
+            raise ValueError(f'buffer stride {self.layout.stride} must be multiplier of bytes len {len(data_bytes)}')
+        element_count = len(data_bytes) // self.layout.stride
+        if first_element + element_count > self.num_elements:
+            raise ValueError(f'cannot interleave {element_count} elements starting from {first_element} '
+                             f'out of {self.num_elements}')
+        records = numpy.frombuffer(data_bytes, self.layout.get_numpy_type())
+        for semantic in self.layout.semantics:
+            records[self.layout.get_field_name(semantic)] = self.data[semantic][first_element:first_element+element_count]
+
+    def write_to(self, fileobj, chunk_rows=65536):
+        """
+        Writes interleaved elements into provided binary file object by chunks of 'chunk_rows' elements
+        Writing of each chunk runs in background while the next one is interleaved, so memory usage is bound by 2 chunks
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f'cannot write buffer by chunks of {chunk_rows} elements')
+        chunk_rows = min(chunk_rows, self.num_elements)
+        if chunk_rows == 0:
+            return
+        chunks = [bytearray(chunk_rows * self.layout.stride) for _ in range(2)]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_write = None
+            for chunk_id, first_element in enumerate(range(0, self.num_elements, chunk_rows)):
+                element_count = min(chunk_rows, self.num_elements - first_element)
+                # Chunk written 2 iterations ago is already flushed, as we wait for every write before submitting next
+                chunk = memoryview(chunks[chunk_id % 2])[:element_count * self.layout.stride]
+                self.interleave(chunk, first_element)
+                if pending_write is not None:
+                    pending_write.result()
+                pending_write = executor.submit(fileobj.write, chunk)
+            pending_write.result()
 
     def get_values(self, semantic):
+        return self.get_array(semantic).ravel().tolist()
+
+    def get_array(self, semantic):
+        """
+        Returns new (num_elements, num_values) array of decoded semantic values
+        """
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        data_bytes = self.get_bytes(semantic)
-        return semantic.format.decoder(data_bytes)
+        return semantic.format.decode_array(self.data[semantic])
 
     def set_bytes(self, semantic, data_bytes):
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        self.data[semantic] = data_bytes
-        self.validate()
+        self.data[semantic] = self.bytes_to_array(semantic, data_bytes)
+        self.fingerprints.pop(semantic, None)
+        self.validate(semantic)
 
     def set_values(self, semantic, values):
+        self.set_array(semantic, values)
+
+    def set_array(self, semantic, values):
+        """
+        Encodes provided values into semantic data, values may be either flat or (num_elements, num_values) shaped
+        """
+        if isinstance(semantic, AbstractSemantic):
+            semantic = self.layout.get_element(semantic)
+        self.data[semantic] = self.values_to_array(semantic, values)
+        self.fingerprints.pop(semantic, None)
+        self.validate(semantic)
+
+    def apply_affine(self, semantic, matrix, offset=None, values=None):
+        """
+        Transforms semantic values as row vectors by provided (num_values, num_values) matrix and optional offset
+        With 'values' provided, transforms them instead of current data, so lossy formats get encoded only once
+        """
         if isinstance(semantic, AbstractSemantic):
             semantic = self.layout.get_element(semantic)
-        self.set_bytes(semantic, semantic.format.encoder(values))
+        values = self.get_float_array(semantic, values)
+        values = numpy.matmul(values, numpy.asarray(matrix, dtype=numpy.float64).T)
+        if offset is not None:
+            values += offset
+        self.set_array(semantic, values)
+
+    def flip_component(self, semantic, component=None, offset=0.0, values=None):
+        """
+        Replaces semantic values of given component (or all components) with 'offset - value'
+        Flips sign with default offset of 0, while offset of 1 flips V of UV coordinates
+        """
+        if isinstance(semantic, AbstractSemantic):
+            semantic = self.layout.get_element(semantic)
+        values = self.get_float_array(semantic, values)
+        if component is None:
+            numpy.subtract(offset, values, out=values)
+        else:
+            numpy.subtract(offset, values[:, component], out=values[:, component])
+        self.set_array(semantic, values)
+
+    def remap_range(self, semantic, src_range, dst_range, values=None):
+        """
+        Linearly maps semantic values from src_range to dst_range, i.e. (-1, 1) to (0, 1) for UNORM normals
+        """
+        if isinstance(semantic, AbstractSemantic):
+            semantic = self.layout.get_element(semantic)
+        scale = (dst_range[1] - dst_range[0]) / (src_range[1] - src_range[0])
+        offset = dst_range[0] - src_range[0] * scale
+        values = self.get_float_array(semantic, values)
+        values *= scale
+        values += offset
+        self.set_array(semantic, values)
+
+    def get_float_array(self, semantic, values=None):
+        """
+        Returns new (num_elements, num_values) float64 array of provided values or of decoded semantic values
+        """
+        if values is None:
+            return self.get_array(semantic).astype(numpy.float64)
+        return self.reshape_array(semantic, numpy.array(values, dtype=numpy.float64))
+
+    def get_writable_array(self, semantic):
+        """
+        Returns semantic data array that is safe to modify in-place, shared array gets copied on first call
+        Cached fingerprint of semantic gets invalidated, as array is expected to be modified
+        """
+        self.fingerprints.pop(semantic, None)
+        data = self.data[semantic]
+        if not data.flags.writeable:
+            data = data.copy()
+            self.data[semantic] = data
+        return data
+
+    def get_fingerprint(self, semantic=None):
+        """
+        Returns content hash of semantic data, or of all elements and layout if no semantic provided
+        Semantic hashes are cached until their data gets replaced or requested for in-place modification
+        """
+        if semantic is None:
+            fingerprint = hashlib.blake2b(self.layout.to_string().encode(), digest_size=16)
+            for semantic in self.layout.semantics:
+                fingerprint.update(bytes.fromhex(self.get_fingerprint(semantic)))
+            return fingerprint.hexdigest()
+        if isinstance(semantic, AbstractSemantic):
+            semantic = self.layout.get_element(semantic)
+        fingerprint = self.fingerprints.get(semantic, None)
+        if fingerprint is None:
+            data = self.data[semantic]
+            fingerprint = hashlib.blake2b(f'{semantic.format.format}:{data.shape}'.encode(), digest_size=16)
+            fingerprint.update(numpy.ascontiguousarray(data))
+            fingerprint = fingerprint.hexdigest()
+            self.fingerprints[semantic] = fingerprint
+        return fingerprint
+
+    def write_file(self, file_path, chunk_rows=65536):
+        """
+        Writes interleaved elements to file, skips writing if file is known to already contain the same elements
+        Returns False if writing was skipped
+        """
+        fingerprint = self.get_fingerprint()
+        file_path = os.path.realpath(file_path)
+        written_file = written_files.pop(file_path, None)
+        if written_file is not None and written_file == (fingerprint, get_file_stat(file_path)):
+            written_files[file_path] = written_file
+            return False
+        with open(file_path, 'wb') as f:
+            self.write_to(f, chunk_rows)
+        written_files[file_path] = (fingerprint, get_file_stat(file_path))
+        while len(written_files) > written_files_limit:
+            del written_files[next(iter(written_files))]
+        return True
+
+    @staticmethod
+    def share_array(data):
+        """
+        Marks array as shared between buffers (or with external memory), so in-place writes would copy it first
+        """
+        data.flags.writeable = False
+        return data
+
+    @classmethod
+    def bytes_to_array(cls, semantic, data_bytes):
+        """
+        Returns shared (num_elements, num_values) array of semantic values mapped to provided bytes
+        """
+        if len(data_bytes) % semantic.stride != 0:
+            raise ValueError(f'{semantic.semantic} stride {semantic.stride} must be multiplier of bytes len {len(data_bytes)}')
+        dtype, shape = semantic.get_numpy_type()
+        return cls.share_array(numpy.frombuffer(data_bytes, dtype).reshape(-1, *shape))
+
+    @staticmethod
+    def values_to_array(semantic, values):
+        """
+        Returns (num_elements, num_values) array of semantic values encoded from provided values
+        """
+        return ByteBuffer.reshape_array(semantic, semantic.format.encode_array(values))
+
+    @staticmethod
+    def convert_array(src_semantic, dst_semantic, data):
+        """
+        Returns (num_elements, num_values) array of dst_semantic values converted from src_semantic array
+        """
+        converter = get_format_converter(src_semantic.format, dst_semantic.format)
+        return ByteBuffer.reshape_array(dst_semantic, converter(data))
+
+    @staticmethod
+    def reshape_array(semantic, data):
+        """
+        Returns (num_elements, num_values) view of provided array of semantic dtype
+        """
+        num_values = semantic.get_num_values()
+        if data.size % num_values != 0:
+            raise ValueError(f'{semantic.semantic} values count {data.size} must be multiplier of {num_values}')
+        return data.reshape(-1, num_values)
 
     @staticmethod
     def map_semantics(src_byte_buffer, dst_byte_buffer, semantic_map=None, skip_missing=False):
@@ -322,7 +791,7 @@ class ByteBuffer:
                 src_semantic = src_semantic
                 if isinstance(src_semantic, AbstractSemantic):
                     src_semantic = src_byte_buffer.layout.get_element(src_semantic)
-                if src_semantic not in src_byte_buffer.layout.semantics:
+                if src_semantic is None or not src_byte_buffer.layout.has_element(src_semantic):
                     if not skip_missing:
                         raise ValueError(f'source buffer has no {src_semantic.semantic} semantic')
                     continue
@@ -330,7 +799,7 @@ class ByteBuffer:
                 dst_semantic = src_semantic
                 if isinstance(src_semantic, AbstractSemantic):
                     dst_semantic = dst_byte_buffer.layout.get_element(dst_semantic)
-                if dst_semantic not in dst_byte_buffer.layout.semantics:
+                if not dst_byte_buffer.layout.has_element(dst_semantic):
                     if not skip_missing:
                         raise ValueError(f'destination buffer has no {dst_semantic.semantic} semantic')
                     continue
@@ -350,6 +819,10 @@ class ByteBuffer:
         return verified_semantic_map
 
 
+# Matches first line of index data that doesn't consist of exactly 3 indices
+malformed_index_line_pattern = re.compile(r'^(?![ \t]*\d+[ \t]+\d+[ \t]+\d+[ \t]*\r?$).*', re.MULTILINE)
+
+
 class IndexBuffer(ByteBuffer):
     def __init__(self, layout, data, load_indices=True):
         self.offset = None
@@ -391,28 +864,29 @@ class IndexBuffer(ByteBuffer):
                 break
 
     def parse_faces(self, f):
-        self.faces = []
-        for line in map(str.strip, f):
-            face = tuple(map(int, line.split()))
-            assert (len(face) == 3)
-            self.faces.append(face)
-        assert (len(self.faces) * 3 == self.index_count)
+        """
+        Parses the rest of the file as whitespace separated indices at once and stores them as (num_faces, 3) array
+        """
+        data = f.read().rstrip()
+        # Parsing at once skips line boundaries, so ensure that every line has exactly 3 indices beforehand
+        malformed_line = malformed_index_line_pattern.search(data) if data else None
+        if malformed_line is not None:
+            raise ValueError(f'malformed IB data line "{malformed_line.group(0).strip()}", expected 3 indices')
+        indices = numpy.fromstring(data, dtype=numpy.int64, sep=' ') if data else numpy.zeros(0, dtype=numpy.int64)
+        if len(indices) != self.index_count:
+            raise ValueError(f'IB data has {len(indices)} indices while index count is {self.index_count}')
+        self.faces = indices.reshape(-1, 3)
 
     def faces_to_bytes(self):
-        indices = []
-        for face in self.faces:
-            assert (len(face) == 3)
-            indices.extend(list(face))
-        assert (len(indices) == self.index_count)
-        data_bytes = self.layout.semantics[0].format.encoder(indices)
-        self.from_bytes(data_bytes)
+        faces = numpy.asarray(self.faces)
+        assert (faces.ndim == 2 and faces.shape[1] == 3)
+        assert (faces.size == self.index_count)
+        indices = self.layout.semantics[0].format.encode_array(faces)
+        self.from_bytes(bytearray(indices.tobytes()))
         assert (self.num_elements * 3 == self.index_count)
 
     def bytes_to_faces(self):
-        self.faces = []
-        for element_id in range(self.num_elements):
-            face = self.get_element(element_id).get_value(self.layout.semantics[0])
-            self.faces.append(tuple(face))
+        self.faces = self.get_array(self.layout.semantics[0]).reshape(-1, 3).astype(numpy.int64)
 
     def get_bytes(self, semantic=None):
         if self.num_elements * 3 != self.index_count:
@@ -420,5 +894,17 @@ class IndexBuffer(ByteBuffer):
         assert (self.num_elements * 3 == self.index_count)
         return super().get_bytes(semantic)
 
+    def write_to(self, fileobj, chunk_rows=65536):
+        if self.num_elements * 3 != self.index_count:
+            self.faces_to_bytes()
+        assert (self.num_elements * 3 == self.index_count)
+        super().write_to(fileobj, chunk_rows)
+
+    def get_fingerprint(self, semantic=None):
+        if self.num_elements * 3 != self.index_count:
+            self.faces_to_bytes()
+        assert (self.num_elements * 3 == self.index_count)
+        return super().get_fingerprint(semantic)
+
     def get_format(self):
         return self.layout.get_element(AbstractSemantic(Semantic.Index)).get_format()
\ No newline at end of file
@@ -1,36 +1,57 @@
 import numpy
-import struct
 
 from enum import Enum
 from typing import Tuple
 
 
+def encode_values(values, dtype):
+    data = numpy.asarray(values)
+    if dtype.kind in 'iu' and not numpy.can_cast(data.dtype, dtype):
+        check_value_range(data, dtype)
+    return numpy.array(data, dtype)
+
+
+def check_value_range(data, dtype):
+    """
+    Raises OverflowError if any value (or NaN) doesn't fit into integer dtype, as casting would silently wrap it
+    """
+    if data.size == 0:
+        return
+    info = numpy.iinfo(dtype)
+    min_value, max_value = data.min(), data.max()
+    if not (min_value >= info.min and max_value <= info.max):
+        raise OverflowError(f'values in range [{min_value}, {max_value}] are out of bounds for {dtype}')
+
+
+def decode_values(data):
+    return numpy.array(data)
+
+
+def encode_normalized(values, dtype):
+    # Quantize private float32 copy of values in-place to avoid temporary arrays
+    data = numpy.array(values, numpy.float32)
+    numpy.multiply(data, float(numpy.iinfo(dtype).max), out=data)
+    numpy.rint(data, out=data)
+    return data.astype(dtype)
+
+
+def decode_normalized(data):
+    return data / float(numpy.iinfo(data.dtype).max)
+
+
 class DXGIEncoderDecoder(Enum):
-    FLOAT32 = (lambda data: b''.join(struct.pack('<f', x) for x in data),
-               lambda data: numpy.frombuffer(data, numpy.float32).tolist())
-    FLOAT16 = (lambda data: numpy.fromiter(data, numpy.float16).tobytes(),
-               lambda data: numpy.frombuffer(data, numpy.float16).tolist())
-    UINT32 = (lambda data: numpy.fromiter(data, numpy.uint32).tobytes(),
-              lambda data: numpy.frombuffer(data, numpy.uint32).tolist())
-    UINT16 = (lambda data: numpy.fromiter(data, numpy.uint16).tobytes(),
-              lambda data: numpy.frombuffer(data, numpy.uint16).tolist())
-    UINT8 = (lambda data: numpy.fromiter(data, numpy.uint8).tobytes(),
-             lambda data: numpy.frombuffer(data, numpy.uint8).tolist())
-    SINT32 = (lambda data: numpy.fromiter(data, numpy.int32).tobytes(),
-              lambda data: numpy.frombuffer(data, numpy.int32).tolist())
-    SINT16 = (lambda data: numpy.fromiter(data, numpy.int16).tobytes(),
-              lambda data: numpy.frombuffer(data, numpy.int16).tolist())
-    SINT8 = (lambda data: numpy.fromiter(data, numpy.int8).tobytes(),
-             lambda data: numpy.frombuffer(data, numpy.int8).tolist())
-    UNORM16 = (
-        lambda data: numpy.around((numpy.fromiter(data, numpy.float32) * 65535.0)).astype(numpy.uint16).tobytes(),
-        lambda data: (numpy.frombuffer(data, numpy.uint16) / 65535.0).tolist())
-    UNORM8 = (lambda data: numpy.around((numpy.fromiter(data, numpy.float32) * 255.0)).astype(numpy.uint8).tobytes(),
-              lambda data: (numpy.frombuffer(data, numpy.uint8) / 255.0).tolist())
-    SNORM16 = (lambda data: numpy.around((numpy.fromiter(data, numpy.float32) * 32767.0)).astype(numpy.int16).tobytes(),
-               lambda data: (numpy.frombuffer(data, numpy.int16) / 32767.0).tolist())
-    SNORM8 = (lambda data: numpy.around((numpy.fromiter(data, numpy.float32) * 127.0)).astype(numpy.int8).tobytes(),
-              lambda data: (numpy.frombuffer(data, numpy.int8) / 127.0).tolist())
+    FLOAT32 = (numpy.float32, encode_values, decode_values)
+    FLOAT16 = (numpy.float16, encode_values, decode_values)
+    UINT32 = (numpy.uint32, encode_values, decode_values)
+    UINT16 = (numpy.uint16, encode_values, decode_values)
+    UINT8 = (numpy.uint8, encode_values, decode_values)
+    SINT32 = (numpy.int32, encode_values, decode_values)
+    SINT16 = (numpy.int16, encode_values, decode_values)
+    SINT8 = (numpy.int8, encode_values, decode_values)
+    UNORM16 = (numpy.uint16, encode_normalized, decode_normalized)
+    UNORM8 = (numpy.uint8, encode_normalized, decode_normalized)
+    SNORM16 = (numpy.int16, encode_normalized, decode_normalized)
+    SNORM8 = (numpy.int8, encode_normalized, decode_normalized)
 
 
 class DXGIFormat(Enum):
@@ -38,14 +59,48 @@ class DXGIFormat(Enum):
         obj = object.__new__(cls)
         obj._value_ = fmt
         obj.format = fmt
-        obj.encoder = encoder_decoder.value[0]
-        obj.decoder = encoder_decoder.value[1]
+        obj.dtype = numpy.dtype(encoder_decoder.value[0])
+        obj.array_encoder = encoder_decoder.value[1]
+        obj.array_decoder = encoder_decoder.value[2]
         obj.byte_width = byte_width
         return obj
 
     def get_format(self):
         return 'DXGI_FORMAT_' + self.format
 
+    def get_num_values(self, byte_width=None):
+        """
+        Returns number of scalar values of format's numpy dtype that fit into provided byte width
+        Without 'byte_width' provided returns number of components of the format itself
+        """
+        if byte_width is None:
+            byte_width = self.byte_width
+        if byte_width % self.dtype.itemsize != 0:
+            raise ValueError(f'byte width {byte_width} is not multiplier of {self.format} value size {self.dtype.itemsize}')
+        return byte_width // self.dtype.itemsize
+
+    def encode_array(self, values):
+        """
+        Returns array of format's numpy dtype with provided values encoded into it, shape of values is preserved
+        """
+        return self.array_encoder(values, self.dtype)
+
+    def decode_array(self, data):
+        """
+        Returns new array of values decoded from provided bytes or array of format's numpy dtype
+        """
+        if not isinstance(data, numpy.ndarray):
+            data = numpy.frombuffer(data, self.dtype)
+        elif data.dtype != self.dtype:
+            raise ValueError(f'cannot decode {data.dtype} array as {self.format}')
+        return self.array_decoder(data)
+
+    def encoder(self, values):
+        return self.encode_array(values).tobytes()
+
+    def decoder(self, data_bytes):
+        return self.decode_array(data_bytes).tolist()
+
     # Float 32
     R32G32B32A32_FLOAT = 'R32G32B32A32_FLOAT', DXGIEncoderDecoder.FLOAT32, 16
     R32G32B32_FLOAT = 'R32G32B32_FLOAT', DXGIEncoderDecoder.FLOAT32, 12
@@ -106,3 +161,54 @@ class DXGIFormat(Enum):
     R8G8B8_SNORM = 'R8G8B8_SNORM', DXGIEncoderDecoder.SNORM8, 3
     R8G8_SNORM = 'R8G8_SNORM', DXGIEncoderDecoder.SNORM8, 2
     R8_SNORM = 'R8_SNORM', DXGIEncoderDecoder.SNORM8, 1
+
+
+format_converters = {}
+
+
+def get_format_converter(src_format, dst_format):
+    """
+    Returns function that converts array of src_format dtype to array of dst_format dtype in one vectorized pass
+    Result is the same as decoding values with src_format and encoding them with dst_format
+    """
+    key = (src_format, dst_format)
+    converter = format_converters.get(key, None)
+    if converter is None:
+        converter = build_format_converter(src_format, dst_format)
+        format_converters[key] = converter
+    return converter
+
+
+def build_format_converter(src_format, dst_format):
+    dst_encoder, dst_dtype = dst_format.array_encoder, dst_format.dtype
+    if src_format.dtype == dst_dtype and src_format.array_decoder is dst_format.array_decoder:
+        # Formats share both dtype and codec, so only number of components may differ
+        return lambda data: numpy.array(data)
+    if src_format.array_decoder is decode_values:
+        # Raw values need no decoding, they can be cast or scaled to destination dtype directly
+        # Integer destination range is checked by its encoder unless source dtype fits into it as is
+        converter = lambda data: dst_encoder(data, dst_dtype)
+    else:
+        src_decoder = src_format.array_decoder
+        converter = lambda data: dst_encoder(src_decoder(data), dst_dtype)
+    src_dtype = numpy.dtype(src_format.dtype)
+    # Lookup table is built from every bit pattern, so destinations with range checked encoding can't use it
+    if src_dtype.itemsize <= 2 and (dst_encoder is encode_normalized or dst_dtype.kind == 'f'):
+        if src_format.array_decoder is decode_normalized or (src_dtype.kind == 'f' and dst_encoder is encode_normalized):
+            return build_lookup_converter(src_dtype, converter)
+    return converter
+
+
+def build_lookup_converter(src_dtype, converter):
+    """
+    Returns function that converts 8-bit or 16-bit data by single lookup in table indexed by unsigned bit pattern
+    Table holds results of provided converter for every bit pattern, so lookup results are identical to its output
+    Pays off when conversion involves float arithmetic, as table gather skips both float intermediates and rounding
+    """
+    index_dtype = numpy.dtype(f'u{src_dtype.itemsize}')
+    bit_patterns = numpy.arange(2 ** (8 * src_dtype.itemsize), dtype=index_dtype).view(src_dtype)
+    # Table covers NaN and out of range patterns as well, their conversion warnings are irrelevant here
+    with numpy.errstate(all='ignore'):
+        table = converter(bit_patterns)
+    table.flags.writeable = False
+    return lambda data: table[data.view(index_dtype)]
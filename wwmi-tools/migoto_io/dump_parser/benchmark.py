@@ -0,0 +1,286 @@
+"""
+Standalone benchmark of frame dump filename and log parsing, runs without Blender:
+
+    cd wwmi-tools
+    python -m migoto_io.dump_parser.benchmark
+
+Compares ResourceDescriptor and FrameDumpLog against reference parsers and fails if they produce different results.
+Log timings include decoding of call parameters, as reference parser decodes every call while FrameDumpLog only on request.
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+from .filename_parser import ResourceDescriptor, slot_type_codepage, shader_type_codepage
+from .log_parser import FrameDumpLog, CallParameters, Dispatch, DrawIndexed
+
+
+class ReferenceResourceDescriptor(ResourceDescriptor):
+    """
+    ResourceDescriptor with original parser that compiles patterns and splits filename part by part
+    """
+    def parse_raw_call(self):
+        raw_call = self.raw
+        if raw_call.find('!U!') != -1:
+            self.marked = True
+            raw_call = raw_call.replace('!U!=', '')
+        call_id_pattern = re.compile(r'^(\d+)-(.*)\.([a-z0-9]+)')
+        result = call_id_pattern.findall(raw_call)
+        if len(result) != 1:
+            return
+        result = result[0]
+        if len(result) != 3:
+            return
+        call_id = result[0]
+        raw_refs = result[1]
+        ext = result[2]
+        shaders_pattern = re.compile(r'-([a-z]s=[a-f0-9]+)')
+        raw_shaders_refs = shaders_pattern.findall(raw_refs)
+        if len(raw_shaders_refs) < 1:
+            return
+        raw_resource_ref = re.sub(shaders_pattern, '', raw_refs)
+
+        self.call_id = call_id
+        self.ext = ext
+        self.parse_raw_resource_ref(raw_resource_ref)
+        self.parse_raw_shader_refs(raw_shaders_refs)
+
+    def parse_raw_slot_ref(self, raw_slot_ref, raw_shader_type):
+        slot_ref_pattern = re.compile(r'^([a-z]+)([0-9]+)?')
+        result = slot_ref_pattern.findall(raw_slot_ref)
+        if len(result) != 1:
+            return
+        result = result[0]
+        self.slot_type = slot_type_codepage.get(result[0], None)
+        if self.slot_type is None:
+            raise ValueError(f'Failed to parse slot ref "{raw_slot_ref}": slot type not recognized!')
+        if len(result) == 2 and result[1] != '':
+            self.slot_id = int(result[1])
+        if raw_shader_type is not None:
+            self.slot_shader_type = shader_type_codepage.get(raw_shader_type, None)
+            if self.slot_shader_type is None:
+                raise ValueError(f'Failed to parse slot shader type "{raw_shader_type}": shader type not recognized!')
+
+
+class ReferenceFrameDumpCall:
+    """
+    FrameDumpCall with original decoder that compiles patterns per call and matches joined lines of log entry
+    """
+    def __init__(self, call_id):
+        self.id = call_id
+        self.parameters = {}
+        self.patterns = {
+            CallParameters.Dispatch: (
+                re.compile(r'^Dispatch\(ThreadGroupCountX:(\d+), ThreadGroupCountY:(\d+), ThreadGroupCountZ:(\d+)\)'),
+                lambda data: Dispatch(int(data[0]), int(data[1]), int(data[2]))
+            ),
+            CallParameters.DrawIndexed: (
+                re.compile(r'^DrawIndexed\(IndexCount:(\d+), StartIndexLocation:(\d+), BaseVertexLocation:(\d+)\)'),
+                lambda data: DrawIndexed(int(data[0]), int(data[1]), int(data[2]))
+            ),
+        }
+
+    def import_data(self, raw_log_entry):
+        raw_log_entry = ' '.join(raw_log_entry)
+        for name, (pattern, decoder) in self.patterns.items():
+            result = pattern.findall(raw_log_entry)
+            if len(result) == 0:
+                continue
+            self.parameters[name] = decoder(result[0])
+
+
+class ReferenceFrameDumpLog:
+    """
+    Original log parser that reads whole log into memory and decodes parameters of every call
+    """
+    def __init__(self, dump_path):
+        self.path = os.path.join(dump_path, 'log.txt')
+        self.calls = {}
+        with open(self.path, "r") as f:
+            lines = f.readlines()
+            call = None
+            raw_log_entry = []
+            for line in lines:
+                raw_call_id = line[0:6]
+                if raw_call_id.isnumeric():
+                    line_call_id = int(raw_call_id)
+                    if call is None or line_call_id != call.id:
+                        call = ReferenceFrameDumpCall(line_call_id)
+                        self.calls[raw_call_id] = call
+                    call.import_data(raw_log_entry)
+                    raw_log_entry = [line[7:]]
+                elif call is not None:
+                    raw_log_entry.append(line.strip())
+            call.import_data(raw_log_entry)
+
+
+def generate_filenames(num_calls, seed=0):
+    """
+    Returns filenames of typical 3dmigoto frame dump, with draw and dispatch calls of various slot sets
+    """
+    rng = random.Random(seed)
+
+    def get_hash(num_bits):
+        return f'{rng.getrandbits(num_bits):0{num_bits // 4}x}'
+
+    filenames = []
+    for call_id in range(num_calls):
+        call_id = f'{call_id:06d}'
+        if rng.random() < 0.2:
+            shaders = f'-cs={get_hash(64)}'
+            slots = [
+                f'cs-cb0={get_hash(32)}',
+                f'cs-t0={get_hash(32)}',
+                f'cs-t1={get_hash(32)}',
+                f'cs-u0={get_hash(32)}',
+            ]
+        else:
+            shaders = f'-vs={get_hash(64)}-ps={get_hash(64)}'
+            slots = [
+                f'ib={get_hash(32)}',
+                f'vb0={get_hash(32)}',
+                f'vb1={get_hash(32)}',
+                f'vs-cb0={get_hash(32)}',
+                f'vs-cb1={get_hash(32)}',
+                f'ps-t0=!U!={get_hash(32)}',
+                f'ps-t1={get_hash(32)}({get_hash(32)})',
+                f'o0={get_hash(32)}',
+                f'o1',
+            ]
+        for slot in slots:
+            if slot.startswith('ib') or slot.startswith('vb'):
+                filenames.append(f'{call_id}-{slot}{shaders}.txt')
+                filenames.append(f'{call_id}-{slot}{shaders}.buf')
+            elif '-t' in slot or slot.startswith('o'):
+                filenames.append(f'{call_id}-{slot}{shaders}.{rng.choice(["dds", "jpg"])}')
+            else:
+                filenames.append(f'{call_id}-{slot}{shaders}.buf')
+    return filenames
+
+
+def generate_log(path, num_calls, seed=0):
+    """
+    Writes log.txt of typical 3dmigoto frame dump, with state setup lines and resource lines of every call
+    """
+    rng = random.Random(seed)
+
+    def get_address():
+        return f'0x{rng.getrandbits(48):016X}'
+
+    with open(os.path.join(path, 'log.txt'), 'w') as f:
+        f.write('analyse_options: 00000000\n')
+        for call_id in range(num_calls):
+            call_id = f'{call_id:06d}'
+            for _ in range(rng.randint(3, 12)):
+                f.write(f'{call_id} VSSetShaderResources(StartSlot:0, NumViews:2, ppShaderResourceViews:{get_address()})\n')
+                for slot_id in range(rng.randint(0, 4)):
+                    f.write(f'       {slot_id}: view={get_address()} resource={get_address()} hash={rng.getrandbits(32):08x}\n')
+            if rng.random() < 0.3:
+                f.write(f'{call_id} Dispatch(ThreadGroupCountX:{rng.randint(1, 256)}, '
+                        f'ThreadGroupCountY:{rng.randint(1, 256)}, ThreadGroupCountZ:1)\n')
+            else:
+                f.write(f'{call_id} DrawIndexed(IndexCount:{rng.randint(3, 99999)}, '
+                        f'StartIndexLocation:{rng.randint(0, 99999)}, BaseVertexLocation:0)\n')
+            f.write(f'       ib={get_address()}\n')
+
+
+def get_log_calls(frame_dump_log):
+    calls = {}
+    for call_id in frame_dump_log.get_call_ids():
+        call = frame_dump_log.get_call(call_id)
+        calls[f'{call_id:06d}'] = (call.id, call.parameters)
+    return calls
+
+
+def decode_log(dump_path, call_ids=None):
+    """
+    Indexes log and decodes parameters of given calls (or of all logged ones) like reference parser does on init
+    """
+    frame_dump_log = FrameDumpLog(dump_path)
+    for call_id in frame_dump_log.get_call_ids() if call_ids is None else call_ids:
+        frame_dump_log.get_call(call_id)
+
+
+def get_reference_log_calls(frame_dump_log):
+    return {raw_call_id: (call.id, call.parameters) for raw_call_id, call in frame_dump_log.calls.items()}
+
+
+def get_fields(resource_descriptor):
+    return (
+        resource_descriptor.call_id, resource_descriptor.marked, resource_descriptor.ext,
+        resource_descriptor.slot_type, resource_descriptor.slot_id, resource_descriptor.slot_shader_type,
+        resource_descriptor.hash, resource_descriptor.old_hash,
+        [(shader.raw, shader.type, shader.hash) for shader in resource_descriptor.shaders],
+    )
+
+
+def measure(parser, paths, repeat):
+    """
+    Returns best of 'repeat' timings of parsing all paths with provided parser class or function
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for path in paths:
+            parser(path)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmark frame dump filename parsing of ResourceDescriptor')
+    parser.add_argument('--calls', type=int, default=10000, help='number of calls in synthetic frame dump')
+    parser.add_argument('--log-calls', type=int, default=20000, help='number of calls in synthetic log.txt')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, best one is reported')
+    args = parser.parse_args(args)
+
+    filenames = generate_filenames(args.calls)
+
+    for filename in filenames:
+        fields = get_fields(ResourceDescriptor(filename))
+        reference_fields = get_fields(ReferenceResourceDescriptor(filename))
+        if fields != reference_fields:
+            print(f'Parsed fields mismatch for "{filename}":\n  {fields}\n  {reference_fields}')
+            return 1
+
+    reference_time = measure(ReferenceResourceDescriptor, filenames, args.repeat)
+    parser_time = measure(ResourceDescriptor, filenames, args.repeat)
+
+    print(f'{"parser":<12} {"ms":>10} {"files/s":>12}')
+    for name, seconds in (('reference', reference_time), ('current', parser_time)):
+        print(f'{name:<12} {seconds * 1000:>10.1f} {len(filenames) / seconds:>12.0f}')
+    print(f'{len(filenames)} filenames, speedup: {reference_time / parser_time:.2f}x')
+
+    with tempfile.TemporaryDirectory() as dump_path:
+        generate_log(dump_path, args.log_calls)
+
+        if get_log_calls(FrameDumpLog(dump_path)) != get_reference_log_calls(ReferenceFrameDumpLog(dump_path)):
+            print(f'Parsed log calls mismatch!')
+            return 1
+
+        # Reference parser decodes every call on init, while current one decodes only calls requested by dump
+        resource_call_ids = sorted(set(ResourceDescriptor(filename).call_id for filename in filenames))
+        log_times = {
+            'reference': measure(ReferenceFrameDumpLog, [dump_path], args.repeat),
+            'index': measure(FrameDumpLog, [dump_path], args.repeat),
+            'index + resource calls': measure(lambda path: decode_log(path, resource_call_ids), [dump_path], args.repeat),
+            'index + all calls': measure(decode_log, [dump_path], args.repeat),
+        }
+        log_size = os.path.getsize(os.path.join(dump_path, 'log.txt')) / 1024 / 1024
+
+    print(f'\n{"log parser":<24} {"ms":>10} {"MB/s":>12}')
+    for name, seconds in log_times.items():
+        print(f'{name:<24} {seconds * 1000:>10.1f} {log_size / seconds:>12.1f}')
+    print(f'{log_size:.1f} MB log, {len(resource_call_ids)} calls with resources, speedup: '
+          f'{log_times["reference"] / log_times["index + resource calls"]:.2f}x with resource calls decoded, '
+          f'{log_times["reference"] / log_times["index + all calls"]:.2f}x with all calls decoded')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,8 +6,8 @@ from dataclasses import dataclass
 from ..buffers.byte_buffer import ByteBuffer, IndexBuffer
 
 from .filename_parser import ShaderType, SlotType, SlotId, CallDescriptor, ResourceDescriptor
-from .dict_filter import DictFilter, FilterCondition, Filter
 from .dump_parser import Dump
+from .resource_index import ResourceIndex
 
 
 @dataclass
@@ -53,6 +53,10 @@ class CallsCollector:
 
     def __post_init__(self):
         self.cache = {}
+        # Resolved branches shared between parents with the same output hash, see resolve_branch
+        self.branches_memo = {}
+        self.branches_memo_hits = 0
+        self.branches_memo_misses = 0
         self.call_branches = self.get_call_branches()
 
     def get_call_branches(self):
@@ -80,20 +84,15 @@ class CallsCollector:
                         for input_slot in shader_map.inputs:
                             if input_slot.shader_id != shader_id:
                                 continue
-                            input_filter_attributes = {
-                                'call_id': root_resource.call_id,  # ID of child call should differ from parent call
-                            }
-                            input_candidate_resources = DictFilter(Filter(
-                                attributes=input_filter_attributes,
-                                dictionaries=self.get_all_slot_resources(shader_map.shader_type, input_slot)
-                            )).filtered_dict
+                            input_candidate_resources = self.dump.graph.get_call_resources(
+                                root_resource.call_id, shader_map.shader_type, input_slot)
                             if len(input_candidate_resources) > 0:
                                 continue
 
                         branch.calls.append(BranchCall(call=root_resource.call))
                         continue
 
-                    nested_branch = self.resolve_branch(output_slot.shader_id, self.shader_data_pattern, root_resource, shader_id)
+                    nested_branch = self.resolve_branches((output_slot.shader_id, root_resource, shader_id))
 
                     if nested_branch is None:
                         continue
@@ -115,8 +114,29 @@ class CallsCollector:
 
         return call_branches
 
-    def resolve_branch(self, shader_id, shader_data_pattern, parent_resource, parent_shader_id):
-        shader_map = shader_data_pattern[shader_id]
+    def resolve_branches(self, work_item):
+        """
+        Resolves branch of (shader_id, parent_resource, parent_shader_id) work item without recursion
+        Resolvers of nested work items are kept in worklist stack, each one is resumed with result of its last work item
+        """
+        worklist = [self.resolve_branch(*work_item)]
+        result = None
+        while len(worklist) > 0:
+            try:
+                nested_work_item = worklist[-1].send(result)
+            except StopIteration as resolved:
+                worklist.pop()
+                result = resolved.value
+                continue
+            worklist.append(self.resolve_branch(*nested_work_item))
+            result = None
+        return result
+
+    def resolve_branch(self, shader_id, parent_resource, parent_shader_id):
+        """
+        Generator that yields work items of nested branches and returns resolved branch, see resolve_branches
+        """
+        shader_map = self.shader_data_pattern[shader_id]
 
         input_slot = None
         for mapped_input_slot in shader_map.inputs:
@@ -125,24 +145,42 @@ class CallsCollector:
         if input_slot is None:
             return None
 
-        branch = ShaderCallBranch(shader_id=shader_id, calls=[], nested_branches=[])
+        # Walk from parent's output to resources of other calls with the same hash bound to the input slot
+        input_candidate_resources = self.dump.graph.get_consumers(parent_resource, shader_map.shader_type, input_slot)
 
-        input_filter_attributes = {
-            '!call_id': parent_resource.call_id,  # ID of child call should differ from parent call
-            'hash': parent_resource.hash,  # Hash of input resource should be the same as one of parent's output
-        }
+        if len(input_candidate_resources) == 0:
+            return None
 
-        input_candidate_resources = DictFilter(Filter(
-            attributes=input_filter_attributes,
-            dictionaries=self.get_all_slot_resources(shader_map.shader_type, input_slot)
-        )).filtered_dict
+        parent_call_id = int(parent_resource.call_id)
+        input_candidate_resources = [
+            input_candidate_resource for input_candidate_resource in input_candidate_resources
+            if int(input_candidate_resource.call_id) >= parent_call_id
+        ]
 
         if len(input_candidate_resources) == 0:
-            return None
+            return (yield from self.build_branch(shader_id, input_candidate_resources))
 
-        for _, input_candidate_resource in input_candidate_resources.items():
-            if int(input_candidate_resource.call_id) < int(parent_resource.call_id):
-                continue
+        # Candidates called before parent are skipped, so parent call affects the branch only via first accepted call
+        memo_key = (
+            shader_id, parent_resource.hash, parent_shader_id,
+            min(int(input_candidate_resource.call_id) for input_candidate_resource in input_candidate_resources)
+        )
+        if memo_key in self.branches_memo:
+            self.branches_memo_hits += 1
+            return self.branches_memo[memo_key]
+        self.branches_memo_misses += 1
+
+        branch = yield from self.build_branch(shader_id, input_candidate_resources)
+        self.branches_memo[memo_key] = branch
+
+        return branch
+
+    def build_branch(self, shader_id, input_candidate_resources):
+        shader_map = self.shader_data_pattern[shader_id]
+
+        branch = ShaderCallBranch(shader_id=shader_id, calls=[], nested_branches=[])
+
+        for input_candidate_resource in input_candidate_resources:
             if branch.get_call(input_candidate_resource.call_id) is not None:
                 continue
             branch.calls.append(BranchCall(call=input_candidate_resource.call))
@@ -161,16 +199,7 @@ class CallsCollector:
 
             for branch_call in branch.calls:
 
-                output_filter_attributes = {
-                    'shaders:type': shader_map.shader_type,
-                    'slot_type': output_slot.slot_type,
-                }
-                if output_slot.slot_id is not None:
-                    output_filter_attributes['slot_id'] = output_slot.slot_id
-                if output_slot.shader_type != ShaderType.Empty:
-                    output_filter_attributes['slot_shader_type'] = output_slot.shader_type
-
-                output_resource = branch_call.call.get_filtered_resource(output_filter_attributes)
+                output_resource = self.get_call_slot_resource(branch_call.call, shader_map.shader_type, output_slot)
 
                 if output_resource is None:
                     continue
@@ -181,7 +210,7 @@ class CallsCollector:
                 else:
                     output_hashes.append(output_resource.hash)
 
-                nested_branch = self.resolve_branch(output_slot.shader_id, shader_data_pattern, output_resource, shader_id)
+                nested_branch = yield (output_slot.shader_id, output_resource, shader_id)
 
                 if nested_branch is None:
                     continue
@@ -209,6 +238,12 @@ class CallsCollector:
 
         return branches
 
+    def get_branches_memo_hit_rate(self):
+        num_lookups = self.branches_memo_hits + self.branches_memo_misses
+        if num_lookups == 0:
+            return 0.0
+        return self.branches_memo_hits / num_lookups
+
     @staticmethod
     def get_root_shaders(shader_data_pattern):
         root_shaders = []
@@ -228,22 +263,20 @@ class CallsCollector:
         if cached_result is not None:
             return cached_result
 
-        input_filter_attributes = {
-            'shaders:type': shader_type,
-            'slot_type': slot.slot_type,
-        }
-        if slot.slot_id is not None:
-            input_filter_attributes['slot_id'] = slot.slot_id
-        if slot.shader_type != ShaderType.Empty:
-            input_filter_attributes['slot_shader_type'] = slot.shader_type
-
-        slot_resources = DictFilter(Filter(
-            attributes=input_filter_attributes,
-            dictionaries=[self.dump.resources]
-        )).filtered_dict
+        slot_resources = ResourceIndex.intersect(
+            self.dump.index.get_shader_type_resources(shader_type),
+            self.dump.index.get_slot_resources(slot.slot_type, slot.slot_id, slot.shader_type),
+        )
 
         self.cache[hash] = slot_resources
 
         return slot_resources
 
-
+    def get_call_slot_resource(self, call, shader_type, slot):
+        result = self.dump.graph.get_call_resources(call.id, shader_type, slot)
+        if len(result) == 1:
+            return result[0]
+        elif len(result) == 0:
+            return None
+        else:
+            raise ValueError(f'Found more than 1 resource with provided attributes!')
@@ -16,12 +16,13 @@ class DataCollector:
     dump: Dump
     shader_data_pattern: Dict[str, ShaderMap]
     shader_resources: Dict[str, DataMap]
+    num_threads: int = 1
     # Output
     call_branches: Dict[str, ShaderCallBranch] = field(init=False)
 
     def __post_init__(self):
         self.calls_collector = CallsCollector(self.dump, self.shader_data_pattern)
         self.call_branches = self.calls_collector.call_branches
-        self.data_collector = ResourceCollector(self.shader_resources, self.call_branches)
+        self.data_collector = ResourceCollector(self.shader_resources, self.call_branches, num_threads=self.num_threads)
 
 
@@ -1,7 +1,6 @@
-
 import operator
 
-from typing import Union, List
+from typing import Union, List, Callable, Optional, Tuple
 from enum import Enum, auto
 from dataclasses import dataclass
 
@@ -21,8 +20,111 @@ class Filter:
     dictionaries: Union[list, dict, List['Filter']] = None
 
 
+@dataclass(frozen=True)
+class CompiledAttribute:
+    """
+    Filter attribute parsed from 'name', '!name', 'name:item_name' or 'name:!__key__' notation
+    """
+    attribute: str
+    name: str
+    getter: Callable
+    must_contain_value: bool
+    item_name: Optional[str] = None
+    item_getter: Optional[Callable] = None
+    values: Tuple = ()
+    values_set: Optional[frozenset] = None
+
+    @classmethod
+    def compile(cls, attribute, values):
+        parts = attribute.split(':')
+        if len(parts) > 2:
+            raise ValueError(f'Invalid filter: more than one instance of ":" is not supported!')
+
+        name = parts[0]
+        must_contain_value = True
+        if name.startswith('!'):
+            must_contain_value = False
+            name = name[1:]
+
+        item_name, item_getter = None, None
+        if len(parts) == 2:
+            item_name = parts[1]
+            # Negation of iterable attribute is defined by its item name
+            must_contain_value = True
+            if item_name.startswith('!'):
+                must_contain_value = False
+                item_name = item_name[1:]
+            if item_name != '__key__':
+                item_getter = operator.attrgetter(item_name)
+
+        values = tuple(values) if isinstance(values, list) else (values,)
+        try:
+            values_set = frozenset(values)
+        except TypeError:
+            values_set = None
+
+        return cls(attribute, name, operator.attrgetter(name), must_contain_value,
+                   item_name, item_getter, values, values_set)
+
+    def has_value(self, value):
+        if self.values_set is not None:
+            try:
+                found = value in self.values_set
+            except TypeError:
+                found = value in self.values
+        else:
+            found = value in self.values
+        return found == self.must_contain_value
+
+    def matches(self, entry):
+        attribute_value = self.getter(entry)
+
+        if self.item_name is None:
+            # Check if given value of object's attribute is among values we're looking for
+            return self.has_value(attribute_value)
+
+        # Check if any value in dict-type object's attribute is among values we're looking for
+        if isinstance(attribute_value, dict):
+            items = attribute_value.items()
+        else:
+            items = enumerate(attribute_value)
+        for key, value in items:
+            if self.item_getter is None:
+                # Search by dict key
+                if self.has_value(key):
+                    return True
+            else:
+                # Search by attribute of object contained in dict value
+                if self.has_value(self.item_getter(value)):
+                    return True
+        return False
+
+
+compiled_filter_attributes = {}
+
+
+def compile_attributes(attributes):
+    """
+    Returns cached list of compiled attributes, so repeated filters are parsed only once
+    """
+    try:
+        key = tuple((attribute, tuple(values) if isinstance(values, list) else values)
+                    for attribute, values in attributes.items())
+        hash(key)
+    except TypeError:
+        return [CompiledAttribute.compile(attribute, values) for attribute, values in attributes.items()]
+
+    compiled = compiled_filter_attributes.get(key, None)
+    if compiled is None:
+        compiled = [CompiledAttribute.compile(attribute, values) for attribute, values in attributes.items()]
+        compiled_filter_attributes[key] = compiled
+    return compiled
+
+
 class DictFilter:
     def __init__(self, filter):
+        # Compiled attributes of validated filters, keyed by id of filter
+        self.compiled_attributes = {}
         self.filter = self.validate_filter(filter)
         self.filtered_dict = self.get_filtered_dict(self.filter)
 
@@ -62,49 +164,39 @@ class DictFilter:
                 if len(attribute.strip()) == 0:
                     raise ValueError(f'Invalid filter: attribute "{attribute}" has no non-whitespace characters!')
 
+            for attribute, values in filter.attributes.items():
+                if not isinstance(values, list):
+                    filter.attributes[attribute] = [values]
+
+            compiled_attributes = compile_attributes(filter.attributes)
+            self.compiled_attributes[id(filter)] = compiled_attributes
+
             for dictionary in filter.dictionaries:
                 if isinstance(dictionary, Filter) or len(dictionary) == 0:
                     continue
+                self.validate_attributes(compiled_attributes, next(iter(dictionary.values())))
 
-                first_dict_entry = next(iter(dictionary.values()))
-
-                for attribute, values in filter.attributes.items():
-                    parts = attribute.split(':')
-                    attribute_name = parts[0]
-
-                    if attribute_name.startswith('!'):
-                        attribute_name = attribute_name[1:]
-
-                    try:
-                        attr = operator.attrgetter(attribute_name)(first_dict_entry)
-                    except Exception:
-                        raise ValueError(f'Invalid filter: data_dict member has no "{parts[0]}" attribute!')
-
-                    if len(parts) == 2:
-                        if not isinstance(attr, Union[list, dict]):
-                            raise ValueError(f'Invalid filter: {attribute} is not iterable!')
-
-                        attribute_name = parts[1]
-
-                        if attribute_name.startswith('!'):
-                            attribute_name = attribute_name[1:]
-
-                        if '__key__' not in attribute_name:
-                            try:
-                                operator.attrgetter(attribute_name)(
-                                    next(iter(attr.values())) if isinstance(attr, dict) else attr[0])
-                            except Exception:
-                                raise ValueError(f'Invalid filter: {attribute} member has no "{attribute_name}" attribute!')
-                    elif len(parts) > 2:
-                        raise ValueError(f'Invalid filter: more than one instance of ":" is not supported!')
+        return filter
 
-                    if not isinstance(values, list):
-                        filter.attributes[attribute] = [values]
+    @staticmethod
+    def validate_attributes(compiled_attributes, first_dict_entry):
+        for compiled_attribute in compiled_attributes:
+            try:
+                attr = compiled_attribute.getter(first_dict_entry)
+            except Exception:
+                raise ValueError(f'Invalid filter: data_dict member has no "{compiled_attribute.attribute.split(":")[0]}" attribute!')
+
+            if compiled_attribute.item_name is None:
+                continue
 
-        return filter
+            if not isinstance(attr, Union[list, dict]):
+                raise ValueError(f'Invalid filter: {compiled_attribute.attribute} is not iterable!')
 
-    def intersection(self, list1, list2):
-        return [value for value in list1 if value in list2]
+            if compiled_attribute.item_getter is not None:
+                try:
+                    compiled_attribute.item_getter(next(iter(attr.values())) if isinstance(attr, dict) else attr[0])
+                except Exception:
+                    raise ValueError(f'Invalid filter: {compiled_attribute.attribute} member has no "{compiled_attribute.item_name}" attribute!')
 
     def get_filtered_dict(self, filter, data_dict=None):
         result = {}
@@ -122,7 +214,7 @@ class DictFilter:
             if filter.dictionaries_condition == FilterCondition.AND:
                 found = dictionaries[0]
                 for i in range(1, len(dictionaries)):
-                    found = {key: found[key] for key in self.intersection(dictionaries[i].keys(), found.keys())}
+                    found = {key: found[key] for key in dictionaries[i].keys() if key in found}
             elif filter.dictionaries_condition == FilterCondition.OR:
                 for dictionary in dictionaries:
                     found.update(dictionary)
@@ -132,9 +224,7 @@ class DictFilter:
         # Filter by keys
         if filter.keys:
             if len(filter.keys) > 0:
-                found = {}
-                for key in self.intersection(filter.keys, data_dict.keys()):
-                    found[key] = data_dict[key]
+                found = {key: data_dict[key] for key in dict.fromkeys(filter.keys) if key in data_dict}
                 if filter.condition == FilterCondition.AND:
                     if len(found) == 0:
                         result = {}
@@ -145,79 +235,26 @@ class DictFilter:
 
         # Filter by attributes of entries
         if filter.attributes_condition:
-            dictionaries = []
-            for filter_attribute, filter_values in filter.attributes.items():
-                dictionary = {}
-                for dict_key, dict_entry in data_dict.items():
-
-                    parts = filter_attribute.split(':')
-
-                    attribute_name = parts[0]
-
-                    # If attribute name has '!' prefix, search for values that aren't in 'filter_values'
-                    must_contain_value = True
-                    if attribute_name.startswith('!'):
-                        must_contain_value = False
-                        attribute_name = attribute_name[1:]
-
-                    attribute_value = operator.attrgetter(attribute_name)(dict_entry)
-
-                    if len(parts) == 1:
-                        # Check if given value of object's attribute is among 'filter_values' we're looking for
-                        if self.has_value(must_contain_value, attribute_value, filter_values):
-                            dictionary[dict_key] = dict_entry
-
-                    elif len(parts) == 2:
-                        # Check if any value in dict-type object's attribute is among 'filter_values' we're looking for
-                        detected = False
-                        for key, value in attribute_value.items() if isinstance(attribute_value, dict) else enumerate(attribute_value):
-
-                            filter_attribute_name = parts[1]
-
-                            # If attribute name has '!' prefix, search for values that aren't in 'filter_values'
-                            must_contain_value = True
-                            if filter_attribute_name.startswith('!'):
-                                must_contain_value = False
-                                filter_attribute_name = filter_attribute_name[1:]
-
-                            if filter_attribute_name == '__key__':
-                                # Search by dict key
-                                if self.has_value(must_contain_value, key, filter_values):
-                                    detected = True
-                                    break
-                            else:
-                                # Search by attribute of object contained in dict value
-                                value_attribute = operator.attrgetter(filter_attribute_name)(value)
-                                if self.has_value(must_contain_value, value_attribute, filter_values):
-                                    detected = True
-                                    break
-
-                        if detected:
-                            dictionary[dict_key] = dict_entry
-
-                dictionaries.append(dictionary)
+            compiled_attributes = self.compiled_attributes.get(id(filter), None)
+            if compiled_attributes is None:
+                compiled_attributes = compile_attributes(filter.attributes)
 
             if filter.condition == FilterCondition.AND:
-                found = dictionaries[0]
-                for i in range(1, len(dictionaries)):
-                    found = {key: found[key] for key in self.intersection(dictionaries[i].keys(), found.keys())}
+                found = {}
+                for dict_key, dict_entry in data_dict.items():
+                    for compiled_attribute in compiled_attributes:
+                        if not compiled_attribute.matches(dict_entry):
+                            break
+                    else:
+                        found[dict_key] = dict_entry
                 result.update(found)
 
             elif filter.condition == FilterCondition.OR:
-                for dictionary in dictionaries:
-                    result.update(dictionary)
+                found = {}
+                for compiled_attribute in compiled_attributes:
+                    for dict_key, dict_entry in data_dict.items():
+                        if dict_key not in found and compiled_attribute.matches(dict_entry):
+                            found[dict_key] = dict_entry
+                result.update(found)
 
         return result
-
-    @staticmethod
-    def has_value(must_contain_value, attribute_value, filter_values):
-        if must_contain_value:
-            if attribute_value in filter_values:
-                return True
-        else:
-            if attribute_value not in filter_values:
-                return True
-        return False
-
-
-
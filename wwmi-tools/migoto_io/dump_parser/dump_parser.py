@@ -1,11 +1,29 @@
 import os
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 
 from .log_parser import FrameDumpLog
 from .filename_parser import ResourceDescriptor, CallDescriptor
+from .resource_index import ResourceIndex
+from .resource_graph import ResourceGraph
+
+
+def scan_dump_directory(dump_directory) -> List[Tuple[str, int]]:
+    """
+    Returns sorted list of (path, size) of resource files, size is taken from directory entry to avoid extra stat calls
+    """
+    entries = []
+    with os.scandir(dump_directory) as it:
+        for entry in it:
+            if entry.name.endswith('txt'):
+                continue
+            if not entry.is_file():
+                continue
+            entries.append((entry.path, entry.stat().st_size))
+    entries.sort()
+    return entries
 
 
 @dataclass
@@ -16,29 +34,24 @@ class Dump:
     log: FrameDumpLog = field(init=False)
     resources: Dict[str, ResourceDescriptor] = field(init=False)
     calls: Dict[str, CallDescriptor] = field(init=False)
+    index: ResourceIndex = field(init=False)
+    graph: ResourceGraph = field(init=False)
 
     def __post_init__(self):
         self.log = FrameDumpLog(self.dump_directory)
         self.resources = {}
         self.calls = {}
 
-        for filename in os.listdir(self.dump_directory):
-            resource_path = os.path.join(self.dump_directory, filename)
-
-            if not os.path.isfile(resource_path):
-                continue
-            if filename.endswith('txt'):
-                continue
-
-            resource_descriptor = ResourceDescriptor(resource_path)
+        for path, file_size in scan_dump_directory(self.dump_directory):
+            resource_descriptor = ResourceDescriptor(path, file_size=file_size)
             self.resources[resource_descriptor.raw] = resource_descriptor
 
             if resource_descriptor.call_id not in self.calls:
-                self.calls[resource_descriptor.call_id] = CallDescriptor(resource_descriptor.call_id)
+                self.calls[resource_descriptor.call_id] = CallDescriptor(resource_descriptor.call_id, self.log)
             call = self.calls[resource_descriptor.call_id]
             resource_descriptor.call = call
 
             call.import_resource_descriptor(resource_descriptor)
-            logged_call = self.log.calls.get(call.id, None)
-            if logged_call is not None:
-                call.parameters = logged_call.parameters
+
+        self.index = ResourceIndex(self.resources)
+        self.graph = ResourceGraph(self.resources)
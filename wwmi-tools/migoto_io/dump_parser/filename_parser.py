@@ -61,6 +61,20 @@ slot_type_codepage = {
 }
 
 
+# Regular resource filename, i.e. `000003-ps-t1=0dbc4afc(5e9494f3)-vs=2fb5a3f559d5a6f9-ps=561bcd63f5b5531a.dds`
+resource_filename_pattern = re.compile(
+    r'(?P<call_id>\d+)-'
+    r'(?:(?P<slot_shader_type>[a-z]s)-)?'
+    r'(?P<slot_type>[a-z]+?)(?P<slot_id>[0-9]+)?'
+    r'(?:=(?P<hash>[^-=().]+)(?:\((?P<old_hash>[^-=().]*)\))?)?'
+    r'(?P<shaders>(?:-[a-z]s=[a-f0-9]+)+)'
+    r'\.(?P<ext>[a-z0-9]+)$'
+)
+call_id_pattern = re.compile(r'^(\d+)-(.*)\.([a-z0-9]+)')
+shader_ref_pattern = re.compile(r'-([a-z]s=[a-f0-9]+)')
+slot_ref_pattern = re.compile(r'^([a-z]+)([0-9]+)?')
+
+
 class ShaderRef:
     def __init__(self, raw_shader_ref):
         self.raw = raw_shader_ref
@@ -86,11 +100,25 @@ class ShaderRef:
         self.type = shader_type_codepage.get(raw_shader_ref, None)
 
 
+shader_refs_cache = {}
+
+
+def get_shader_refs(raw_shaders_refs):
+    """
+    Returns cached shader refs of '-vs=...-ps=...' filename part, as it's shared by all resources of the call
+    """
+    shader_refs = shader_refs_cache.get(raw_shaders_refs, None)
+    if shader_refs is None:
+        shader_refs = tuple(ShaderRef(raw_shader_ref) for raw_shader_ref in shader_ref_pattern.findall(raw_shaders_refs))
+        shader_refs_cache[raw_shaders_refs] = shader_refs
+    return shader_refs
+
+
 class ResourceData:
-    def __init__(self, file_path):
+    def __init__(self, file_path, file_size=None):
         self.path = file_path
         self.bytes = None
-        self.len = None
+        self.len = file_size
         self.sha256 = None
 
     def load(self):
@@ -100,6 +128,17 @@ class ResourceData:
     def unload(self):
         self.bytes = None
 
+    def read_hash(self):
+        """
+        Calculates sha256 and len of resource file chunk by chunk, without loading whole file to memory
+        """
+        sha256 = hashlib.sha256()
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        self.sha256 = sha256.hexdigest()
+        self.len = os.path.getsize(self.path)
+
     def update_hash(self):
         if self.bytes is None:
             raise ValueError("Failed to update resource hash: file not loaded!")
@@ -112,7 +151,7 @@ class ResourceData:
 
 
 class ResourceDescriptor:
-    def __init__(self, resource_file_path, calculate_sha256=False):
+    def __init__(self, resource_file_path, calculate_sha256=False, file_size=None):
         self.path = resource_file_path
         self.raw = os.path.basename(resource_file_path)
         self.marked = False
@@ -124,7 +163,7 @@ class ResourceDescriptor:
         self.slot_shader_type = None
         self.hash = None
         self.old_hash = None
-        self.data = ResourceData(self.path)
+        self.data = ResourceData(self.path, file_size)
         self.shaders = []
         if calculate_sha256:
             self.hash_data()
@@ -134,6 +173,29 @@ class ResourceDescriptor:
     def __repr__(self):
         return self.raw
 
+    def __getstate__(self):
+        # Pickle parsed fields as plain values, as it's much faster to transfer than enums and nested objects
+        # Call isn't pickled, it's linked to descriptor by Dump
+        return (
+            self.path, self.marked, self.call_id, self.ext,
+            self.slot_type.value if self.slot_type is not None else None,
+            self.slot_id,
+            self.slot_shader_type.value if self.slot_shader_type is not None else None,
+            self.hash, self.old_hash, self.data.len, self.data.sha256,
+            ''.join(f'-{shader.raw}' for shader in self.shaders),
+        )
+
+    def __setstate__(self, state):
+        (self.path, self.marked, self.call_id, self.ext, slot_type, self.slot_id, slot_shader_type,
+         self.hash, self.old_hash, data_len, data_sha256, raw_shaders_refs) = state
+        self.raw = os.path.basename(self.path)
+        self.call = None
+        self.slot_type = slot_type_codepage[slot_type] if slot_type is not None else None
+        self.slot_shader_type = shader_type_codepage[slot_shader_type] if slot_shader_type is not None else None
+        self.data = ResourceData(self.path, data_len)
+        self.data.sha256 = data_sha256
+        self.shaders = list(get_shader_refs(raw_shaders_refs))
+
     def validate(self):
         if self.call_id is None:
             raise ValueError(f'Failed to parse raw descriptor "{self.raw}": no call id detected!')
@@ -143,32 +205,17 @@ class ResourceDescriptor:
             raise ValueError(f'Failed to parse raw descriptor "{self.raw}": no shader refs detected!')
 
     def get_sha256(self):
-        is_unloaded = self.data.sha256 is None
-        if is_unloaded:
-            self.data.load()
-            self.data.update_hash()
-            self.data.update_len()
-        sha256 = self.data.sha256
-        if is_unloaded:
-            self.data.unload()
-        return sha256
+        if self.data.sha256 is None:
+            self.data.read_hash()
+        return self.data.sha256
 
     def get_len(self):
-        is_unloaded = self.data.len is None
-        if is_unloaded:
-            self.data.load()
-            self.data.update_hash()
-            self.data.update_len()
-        data_len = self.data.len
-        if is_unloaded:
-            self.data.unload()
-        return data_len
+        if self.data.len is None:
+            self.data.read_hash()
+        return self.data.len
 
     def hash_data(self):
-        self.data.load()
-        self.data.update_hash()
-        self.data.update_len()
-        self.data.unload()
+        self.data.read_hash()
 
     def get_bytes(self):
         is_unloaded = self.data.bytes is None
@@ -191,8 +238,26 @@ class ResourceDescriptor:
         if raw_call.find('!U!') != -1:
             self.marked = True
             raw_call = raw_call.replace('!U!=', '')
+        # Parse whole filename in one scan, it matches all regular 3dmigoto dump filenames
+        result = resource_filename_pattern.match(raw_call)
+        if result is None:
+            self.parse_raw_call_by_parts(raw_call)
+            return
+        raw_slot_shader_type, raw_slot_type, raw_slot_id, raw_hash, raw_old_hash, raw_shaders_refs, ext = result.group(
+            'slot_shader_type', 'slot_type', 'slot_id', 'hash', 'old_hash', 'shaders', 'ext')
+
+        self.call_id = result.group('call_id')
+        self.ext = ext
+        self.hash = raw_hash
+        self.old_hash = raw_old_hash
+        self.set_slot_ref(raw_slot_type, raw_slot_id, raw_slot_shader_type, raw_slot_type + (raw_slot_id or ''))
+        self.shaders.extend(get_shader_refs(raw_shaders_refs))
+
+    def parse_raw_call_by_parts(self, raw_call):
+        """
+        Parses filename step by step, handles irregular filenames that resource_filename_pattern doesn't match
+        """
         # Match call id
-        call_id_pattern = re.compile(r'^(\d+)-(.*)\.([a-z0-9]+)')
         result = call_id_pattern.findall(raw_call)
         # Return if call id not found
         if len(result) != 1:
@@ -205,14 +270,13 @@ class ResourceDescriptor:
         raw_refs = result[1]
         ext = result[2]
         # Match shader refs
-        shaders_pattern = re.compile(r'-([a-z]s=[a-f0-9]+)')
-        raw_shaders_refs = shaders_pattern.findall(raw_refs)
+        raw_shaders_refs = shader_ref_pattern.findall(raw_refs)
         # Return if no shader refs found
         if len(raw_shaders_refs) < 1:
             return
         # Remove shaders refs from the raw string
         # Only resource ref should be left in raw string at this point
-        raw_resource_ref = re.sub(shaders_pattern, '', raw_refs)
+        raw_resource_ref = shader_ref_pattern.sub('', raw_refs)
 
         self.call_id = call_id
         self.ext = ext
@@ -245,16 +309,18 @@ class ResourceDescriptor:
             self.parse_raw_slot_ref(resource_desc[1], resource_desc[0])
 
     def parse_raw_slot_ref(self, raw_slot_ref, raw_shader_type):
-        slot_ref_pattern = re.compile(r'^([a-z]+)([0-9]+)?')
         result = slot_ref_pattern.findall(raw_slot_ref)
         if len(result) != 1:
             return
         result = result[0]
-        self.slot_type = slot_type_codepage.get(result[0], None)
+        self.set_slot_ref(result[0], result[1], raw_shader_type, raw_slot_ref)
+
+    def set_slot_ref(self, raw_slot_type, raw_slot_id, raw_shader_type, raw_slot_ref):
+        self.slot_type = slot_type_codepage.get(raw_slot_type, None)
         if self.slot_type is None:
             raise ValueError(f'Failed to parse slot ref "{raw_slot_ref}": slot type not recognized!')
-        if len(result) == 2 and result[1] != '':
-            self.slot_id = int(result[1])
+        if raw_slot_id:
+            self.slot_id = int(raw_slot_id)
         if raw_shader_type is not None:
             self.slot_shader_type = shader_type_codepage.get(raw_shader_type, None)
             if self.slot_shader_type is None:
@@ -269,12 +335,25 @@ class ResourceDescriptor:
 
 
 class CallDescriptor:
-    def __init__(self, call_id):
+    def __init__(self, call_id, log=None):
         self.id = call_id
-        self.parameters = {}
+        # FrameDumpLog to decode parameters from when they're accessed for the first time
+        self.log = log
+        self._parameters = None
         self.shaders = {}
         self.resources = {}
 
+    @property
+    def parameters(self):
+        if self._parameters is None:
+            logged_call = self.log.get_call(self.id) if self.log is not None else None
+            self._parameters = logged_call.parameters if logged_call is not None else {}
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        self._parameters = parameters
+
     def import_resource_descriptor(self, resource_descriptor):
         if resource_descriptor.call_id != self.id:
             raise ValueError(f'Failed to import resource descriptor {resource_descriptor.raw}: call id mismatch!')
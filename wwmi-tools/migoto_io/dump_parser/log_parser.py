@@ -1,6 +1,7 @@
 import os
 import re
 
+from array import array
 from enum import Enum, auto
 from dataclasses import dataclass
 
@@ -24,68 +25,136 @@ class CallParameters(Enum):
     DrawIndexed = auto()
 
 
+# Decoders of parameters of logged API calls, keyed by API name
+call_parameters_decoders = {
+    b'Dispatch': (
+        CallParameters.Dispatch,
+        re.compile(rb'Dispatch\(ThreadGroupCountX:(\d+), ThreadGroupCountY:(\d+), ThreadGroupCountZ:(\d+)\)'),
+        lambda data: Dispatch(int(data[1]), int(data[2]), int(data[3]))
+    ),
+    b'DrawIndexed': (
+        CallParameters.DrawIndexed,
+        re.compile(rb'DrawIndexed\(IndexCount:(\d+), StartIndexLocation:(\d+), BaseVertexLocation:(\d+)\)'),
+        lambda data: DrawIndexed(int(data[1]), int(data[2]), int(data[3]))
+    ),
+}
+
+# Matches 6 digits of call id at the start of line and rest of line with API call that has known decoder,
+# 7th character of line is skipped as separator
+call_line_pattern = re.compile(rb'\n(\d{6})[^\n]?((?:' + b'|'.join(call_parameters_decoders) + rb')\([^\n]*)?')
+
+# Matches block of lines of the same call: line starting with 6 digits of call id followed by lines with the same
+# call id or without any, group 'last' captures call id of the last line of the block with one
+call_lines_pattern = re.compile(rb'\n(\d{6})[^\n]*(?:\n(?:(?P<last>\1)|(?!\d{6}))[^\n]*)*')
+
+
+def decode_call_parameters(api_call):
+    """
+    Returns (CallParameters, parameters) decoded from logged API call, or None if it doesn't match decoder of API
+    """
+    name, pattern, decode = call_parameters_decoders[api_call[:api_call.index(b'(')]]
+    result = pattern.match(api_call)
+    if result is None:
+        return None
+    return name, decode(result)
+
+
+def read_line_chunks(f, chunk_size=1024*1024):
+    """
+    Yields (offset, chunk) of binary file split at line breaks, each chunk starts with line break preceding its first
+    line and offset is position of chunk in file, so chunk[i] is located at offset + i
+    """
+    offset = -1
+    tail = b'\n'
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        chunk = tail + data
+        chunk_end = chunk.rfind(b'\n')
+        tail = chunk[chunk_end:]
+        if chunk_end > 0:
+            yield offset, chunk[:chunk_end]
+            offset += chunk_end
+    if len(tail) > 1:
+        yield offset, tail
+
+
 class FrameDumpCall:
     def __init__(self, call_id):
         self.id = call_id
         self.parameters = {}
-        self.patterns = {
-            CallParameters.Dispatch: (
-                re.compile(r'^Dispatch\(ThreadGroupCountX:(\d+), ThreadGroupCountY:(\d+), ThreadGroupCountZ:(\d+)\)'),
-                lambda data: Dispatch(int(data[0]), int(data[1]), int(data[2]))
-            ),
-            CallParameters.DrawIndexed: (
-                re.compile(r'^DrawIndexed\(IndexCount:(\d+), StartIndexLocation:(\d+), BaseVertexLocation:(\d+)\)'),
-                lambda data: DrawIndexed(int(data[0]), int(data[1]), int(data[2]))
-            ),
-        }
-
-    def import_data(self, raw_log_entry):
-        raw_log_entry = ' '.join(raw_log_entry)
-        for name, (pattern, decoder) in self.patterns.items():
-            result = pattern.findall(raw_log_entry)
-            if len(result) == 0:
-                continue
-            if len(result) != 1:
-                raise ValueError(f'More than 1 data entries for pattern {pattern} in {raw_log_entry}')
-            self.parameters[name] = decoder(result[0])
+
+    def import_data(self, call_parameters):
+        if call_parameters is None:
+            return
+        name, parameters = call_parameters
+        self.parameters[name] = parameters
 
 
 class FrameDumpLog:
+    """
+    Index of byte ranges of calls in log.txt, parameters of call are decoded from its byte range on request
+    Parameters of line are imported into the call of the next line with call id, so byte range of call starts
+    from the last line of previous call and ends before its own last line, except for the last call in the log
+    """
     def __init__(self, dump_path):
         self.path = os.path.join(dump_path, 'log.txt')
-        self.calls = {}
-        self.parse_log()
+        # Byte ranges of calls indexed by call id, -1 for call ids missing in the log
+        self.call_starts = array('q')
+        self.call_ends = array('q')
+        self.index_log()
         self.validate()
 
     def validate(self):
         pass
 
-    def parse_log(self):
-        self.calls = {}
-        with (open(self.path, "r") as f):
-            lines = f.readlines()
-            call = None
-            raw_log_entry = []
-            for line_id, line in enumerate(lines):
-                raw_call_id = line[0:6]
-                if raw_call_id.isnumeric():
-                    line_call_id = int(raw_call_id)
-                    if call is None:
-                        call = FrameDumpCall(line_call_id)
-                        self.calls[raw_call_id] = call
-                    elif line_call_id != call.id:
-                        call = FrameDumpCall(line_call_id)
-                        if line_call_id in self.calls:
-                            raise ValueError(f'Malformed log line {line_id}: '
-                                             f'data collection for call id {raw_call_id} was already finished, '
-                                             f'current call id: {call.id}')
-                        self.calls[raw_call_id] = call
-                    call.import_data(raw_log_entry)
-                    raw_log_entry = [line[7:]]
-                elif call is None:
-                    continue
-                else:
-                    raw_log_entry.append(line.strip())
-            # Handle last line of the log
-            call.import_data(raw_log_entry)
+    def index_log(self):
+        """
+        Scans log once in chunks, lines of the same call are skipped in a single match of pattern
+        """
+        self.call_starts = array('q')
+        self.call_ends = array('q')
+        with (open(self.path, "rb") as f):
+            raw_call_id = None
+            call_id = None
+            last_line_offset = None
+            for chunk_offset, chunk in read_line_chunks(f):
+                for result in call_lines_pattern.finditer(chunk):
+                    # Block of the same call may be split between chunks
+                    if result[1] != raw_call_id:
+                        if call_id is None:
+                            last_line_offset = chunk_offset + result.start(1)
+                        else:
+                            self.call_ends[call_id] = last_line_offset
+                        raw_call_id = result[1]
+                        call_id = int(raw_call_id)
+                        if call_id >= len(self.call_starts):
+                            missing_call_ids = array('q', [-1]) * (call_id + 1 - len(self.call_starts))
+                            self.call_starts.extend(missing_call_ids)
+                            self.call_ends.extend(missing_call_ids)
+                        self.call_starts[call_id] = last_line_offset
+                    last_line_start = result.start('last')
+                    last_line_offset = chunk_offset + (last_line_start if last_line_start != -1 else result.start(1))
+            if call_id is not None:
+                self.call_ends[call_id] = f.tell()
+
+    def get_call_ids(self):
+        return [call_id for call_id, start in enumerate(self.call_starts) if start != -1]
 
+    def get_call(self, call_id):
+        """
+        Returns FrameDumpCall with parameters decoded from byte range of given call id, or None if it's not logged
+        """
+        call_id = int(call_id)
+        if call_id >= len(self.call_starts) or self.call_starts[call_id] == -1:
+            return None
+        start, end = self.call_starts[call_id], self.call_ends[call_id]
+        with (open(self.path, "rb") as f):
+            f.seek(start)
+            data = b'\n' + f.read(end - start)
+        call = FrameDumpCall(call_id)
+        for raw_line_call_id, api_call in call_line_pattern.findall(data):
+            if api_call:
+                call.import_data(decode_call_parameters(api_call))
+        return call
@@ -2,6 +2,7 @@ import time
 
 from typing import Union, List, Dict
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 from ..buffers.byte_buffer import ByteBuffer, BufferElementLayout, IndexBuffer
 
@@ -31,22 +32,76 @@ class ResourceCollector:
     shader_resources: Dict[str, DataMap]
     call_branches: Dict[str, ShaderCallBranch] = None
     cache: Dict[str, Union[ByteBuffer, IndexBuffer]] = None
+    # Number of threads to hash and load resource files with
+    num_threads: int = 1
 
     def __post_init__(self):
         self.cache = {}
-        for shader_id, shader_call_branch in self.call_branches.items():
-            self.collect_branch_data(shader_id, shader_call_branch)
+        self.collect_resources(self.get_work_items())
 
-    def collect_branch_data(self, shader_id, shader_call_branch):
-        for branch_call in shader_call_branch.calls:
-            for resource_tag, data_map in self.shader_resources.items():
-                for source in data_map.sources:
-                    if source.shader_id == shader_id:
-                        self.collect_branch_call_resource(branch_call, resource_tag, source, data_map.layout)
-        for nested_branch in shader_call_branch.nested_branches:
-            self.collect_branch_data(nested_branch.shader_id, nested_branch)
+    def get_work_items(self):
+        """
+        Returns (branch_call, resource_tag, source, layout) work items of all branches in depth-first order
+        Branches are walked with worklist stack instead of recursion, shared nested branches are visited once
+        """
+        work_items = []
+        visited_branches = set()
+        worklist = list(reversed(self.call_branches.items()))
+        while len(worklist) > 0:
+            shader_id, shader_call_branch = worklist.pop()
+            if id(shader_call_branch) in visited_branches:
+                continue
+            visited_branches.add(id(shader_call_branch))
+            for branch_call in shader_call_branch.calls:
+                for resource_tag, data_map in self.shader_resources.items():
+                    for source in data_map.sources:
+                        if source.shader_id == shader_id:
+                            work_items.append((branch_call, resource_tag, source, data_map.layout))
+            for nested_branch in reversed(shader_call_branch.nested_branches):
+                worklist.append((nested_branch.shader_id, nested_branch))
+        return work_items
 
-    def collect_branch_call_resource(self, branch_call, resource_tag, source, layout):
+    def collect_resources(self, work_items):
+        # Locate resources of all work items, hashing and loading of files is deferred to run them in thread pool
+        located_resources = []
+        txt_resources = {}
+        for branch_call, resource_tag, source, layout in work_items:
+            resource, layout = self.locate_branch_call_resource(branch_call, resource_tag, source, layout)
+            # Contents of .buf IB isn't always accurate, so it can make sense to use .txt instead
+            if layout is not None and source.slot_type == SlotType.IndexBuffer and source.file_ext == 'txt':
+                txt_path = resource.path.replace('.buf', '.txt')
+                if txt_path not in txt_resources:
+                    txt_resources[txt_path] = ResourceDescriptor(txt_path)
+                resource = txt_resources[txt_path]
+            located_resources.append((branch_call, resource_tag, source, layout, resource))
+
+        # Calculate sha256 of each file once
+        resources_to_hash = {}
+        for _, _, _, layout, resource in located_resources:
+            if layout is not None:
+                resources_to_hash[resource.path] = resource
+        resource_hashes = dict(zip(resources_to_hash.keys(), self.map(
+            lambda resource: resource.get_sha256(), resources_to_hash.values())))
+
+        # Load each unique file contents once, with layout of its first work item
+        resources_to_load = {}
+        for _, _, source, layout, resource in located_resources:
+            if layout is None:
+                continue
+            resource_hash = resource_hashes[resource.path]
+            if resource_hash not in self.cache and resource_hash not in resources_to_load:
+                resources_to_load[resource_hash] = (resource, source, layout)
+        self.cache.update(zip(resources_to_load.keys(), self.map(
+            lambda args: self.load_resource(*args), resources_to_load.values())))
+
+        for branch_call, resource_tag, source, layout, resource in located_resources:
+            if layout is not None:
+                resource = self.cache[resource_hashes[resource.path]]
+            if branch_call.resources is None:
+                branch_call.resources = {}
+            branch_call.resources[resource_tag] = resource
+
+    def locate_branch_call_resource(self, branch_call, resource_tag, source, layout):
 
         filter_attributes = {
             'slot_type': source.slot_type,
@@ -64,32 +119,21 @@ class ResourceCollector:
             else:
                 raise ValueError(f'Failed to locate required resource {resource_tag} at {source} in call {branch_call.call}!')
 
-        if layout is not None:
-
-            # Contents of .buf IB isn't always accurate, so it can make sense to use .txt instead
-            if source.slot_type == SlotType.IndexBuffer and source.file_ext == 'txt':
-                txt_path = resource.path.replace('.buf', '.txt')
-                resource = ResourceDescriptor(txt_path)
-
-            resource_hash = resource.get_sha256()
-
-            cached_resource = self.cache.get(resource_hash, None)
-
-            if cached_resource is None:
-                if source.slot_type == SlotType.IndexBuffer and source.file_ext == 'txt':
-                    with open(resource.path, 'r') as f:
-                        resource = IndexBuffer(layout, f)
-                else:
-                    resource = ByteBuffer(layout, resource.get_bytes())
-
-                self.cache[resource_hash] = resource
-            else:
-                resource = cached_resource
+        return resource, layout
 
-        if branch_call.resources is None:
-            branch_call.resources = {}
+    @staticmethod
+    def load_resource(resource, source, layout):
+        if source.slot_type == SlotType.IndexBuffer and source.file_ext == 'txt':
+            with open(resource.path, 'r') as f:
+                return IndexBuffer(layout, f)
+        else:
+            return ByteBuffer(layout, file_path=resource.path)
 
-        branch_call.resources[resource_tag] = resource
+    def map(self, func, items):
+        if self.num_threads is None or self.num_threads <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+            return list(executor.map(func, items))
 
     # def run(self):
     #     shapekey_resources = self.get_shapekey_resources()
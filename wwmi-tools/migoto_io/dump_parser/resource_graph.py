@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional
+from enum import Enum, auto
+from dataclasses import dataclass, field
+
+from .filename_parser import ResourceDescriptor, ShaderType, SlotType
+
+
+class BindingDirection(Enum):
+    Input = auto()
+    Output = auto()
+    InputOutput = auto()
+
+
+slot_type_directions = {
+    SlotType.ConstantBuffer: BindingDirection.Input,
+    SlotType.IndexBuffer: BindingDirection.Input,
+    SlotType.VertexBuffer: BindingDirection.Input,
+    SlotType.Texture: BindingDirection.Input,
+    SlotType.RenderTarget: BindingDirection.Output,
+    SlotType.UAV: BindingDirection.InputOutput,
+}
+
+
+@dataclass(frozen=True)
+class ResourceBinding:
+    call_id: str
+    slot_type: SlotType
+    slot_id: Optional[int]
+    slot_shader_type: Optional[ShaderType]
+    direction: BindingDirection
+    shader_types: frozenset
+    resource: ResourceDescriptor
+
+    def is_bound_to(self, shader_type, slot):
+        """
+        Returns True if resource is bound to the slot of call of given shader type, Empty slot shader type matches any
+        """
+        if self.slot_type != slot.slot_type:
+            return False
+        if slot.slot_id is not None and self.slot_id != slot.slot_id:
+            return False
+        if slot.shader_type != ShaderType.Empty and self.slot_shader_type != slot.shader_type:
+            return False
+        return shader_type in self.shader_types
+
+
+@dataclass
+class ResourceGraph:
+    """
+    Producer/consumer graph of dump resources, links calls via bindings of the same content hash
+    Bindings are listed in order of indexed resources, so walks keep order of resources in dump
+    """
+    # Input
+    resources: Dict[str, ResourceDescriptor]
+    # Output
+    # Bindings that read content of resource, write-only ones can't consume output of other call
+    consumers: Dict[str, List[ResourceBinding]] = field(init=False)
+    calls: Dict[str, List[ResourceBinding]] = field(init=False)
+
+    def __post_init__(self):
+        self.consumers = {}
+        self.calls = {}
+        for resource in self.resources.values():
+            binding = ResourceBinding(
+                call_id=resource.call_id,
+                slot_type=resource.slot_type,
+                slot_id=resource.slot_id,
+                slot_shader_type=resource.slot_shader_type,
+                direction=slot_type_directions[resource.slot_type],
+                shader_types=frozenset(shader.type for shader in resource.shaders),
+                resource=resource,
+            )
+            if binding.direction != BindingDirection.Output:
+                self.consumers.setdefault(resource.hash, []).append(binding)
+            self.calls.setdefault(resource.call_id, []).append(binding)
+
+    def get_consumers(self, resource, shader_type, slot):
+        """
+        Returns resources of other calls that read the same hash via given slot of given shader type
+        """
+        return [
+            binding.resource for binding in self.consumers.get(resource.hash, [])
+            if binding.call_id != resource.call_id and binding.is_bound_to(shader_type, slot)
+        ]
+
+    def get_call_resources(self, call_id, shader_type, slot):
+        """
+        Returns resources of given call bound to given slot of given shader type
+        """
+        return [
+            binding.resource for binding in self.calls.get(call_id, [])
+            if binding.is_bound_to(shader_type, slot)
+        ]
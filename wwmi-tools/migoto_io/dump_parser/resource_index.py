@@ -0,0 +1,55 @@
+from typing import Dict, Tuple, Optional
+from dataclasses import dataclass, field
+
+from .filename_parser import ResourceDescriptor, ShaderType, SlotType
+
+
+@dataclass
+class ResourceIndex:
+    """
+    Inverted index of dump resources by slot and shader type only
+    Resources are looked up by hash via Dump.graph and by call id via Dump.calls instead
+    Buckets are dicts used as ordered sets of resource keys, so query results keep order of indexed resources
+    """
+    # Input
+    resources: Dict[str, ResourceDescriptor]
+    # Output
+    slots: Dict[Tuple[SlotType, Optional[int], Optional[ShaderType]], Dict[str, ResourceDescriptor]] = field(init=False)
+    shader_types: Dict[ShaderType, Dict[str, ResourceDescriptor]] = field(init=False)
+
+    def __post_init__(self):
+        self.slots = {}
+        self.shader_types = {}
+        for resource_key, resource in self.resources.items():
+            self.add_resource(resource_key, resource)
+
+    def add_resource(self, resource_key, resource):
+        # Slot queries may omit slot id and slot shader type, so resource is also indexed with None as wildcard
+        for slot_id in dict.fromkeys((resource.slot_id, None)):
+            for slot_shader_type in dict.fromkeys((resource.slot_shader_type, None)):
+                self.slots.setdefault((resource.slot_type, slot_id, slot_shader_type), {})[resource_key] = resource
+        for shader_type in dict.fromkeys(shader.type for shader in resource.shaders):
+            self.shader_types.setdefault(shader_type, {})[resource_key] = resource
+
+    def get_slot_resources(self, slot_type, slot_id=None, slot_shader_type=None):
+        """
+        Returns resources bound to given slot, slot id and slot shader type set to None match any value
+        """
+        if slot_shader_type == ShaderType.Empty:
+            slot_shader_type = None
+        return self.slots.get((slot_type, slot_id, slot_shader_type), {})
+
+    def get_shader_type_resources(self, shader_type):
+        return self.shader_types.get(shader_type, {})
+
+    @staticmethod
+    def intersect(*buckets):
+        """
+        Returns resources present in all provided buckets, iterates over the smallest one
+        """
+        smallest = min(buckets, key=len)
+        others = [bucket for bucket in buckets if bucket is not smallest]
+        return {
+            resource_key: resource for resource_key, resource in smallest.items()
+            if all(resource_key in bucket for bucket in others)
+        }
@@ -342,6 +342,7 @@ class WWMI_Export(bpy.types.Operator):
                 IndexBuffer={},
                 VertexBuffers={},
                 ShapeKeyBuffers={},
+                BufferTransforms=default_data_map.BufferTransforms,
             )
 
             # Loop data is used to create list of exported vertices, so there are only two options for partial export: